@@ -100,7 +100,8 @@ class Application:
                     "status": exc.status,
                     "message": exc.exception,
                     "requestedUrl": f"{request.url}"
-                }
+                },
+                headers=exc.headers
             )
 
         @self.__app.exception_handler(RequestValidationError)
@@ -0,0 +1,86 @@
+import datetime
+from typing import Literal
+from application.modules.database.database_models import Logins
+from application.modules.utils.pagination import encode_cursor, decode_cursor, keyset_filter
+
+HISTORY_SORT = [("timestamp", -1), ("_id", -1)]
+
+
+async def get_login_history(user_uid: str, limit: int, cursor: str | None = None,
+                            login_status: bool | None = None) -> tuple[list[dict], str | None]:
+    """
+    Login-Verlauf eines Benutzers, neueste zuerst, mit Keyset-Pagination auf (timestamp, _id).
+    Nutzt den Index (userUid, timestamp).
+    """
+    match: dict = {"userUid": user_uid}
+    if login_status is not None:
+        match["status"] = login_status
+    if cursor:
+        match.update(keyset_filter(HISTORY_SORT, decode_cursor(cursor, len(HISTORY_SORT))))
+
+    entries = await Logins.get_motor_collection().aggregate([
+        {"$match": match},
+        {"$sort": dict(HISTORY_SORT)},
+        {"$limit": limit + 1},
+        {"$project": {"timestamp": 1, "ipAddress": 1, "userAgent": 1, "status": 1}}
+    ]).to_list(limit + 1)
+
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1]["timestamp"], entries[-1]["_id"])
+    return entries, next_cursor
+
+
+async def get_failed_login_groups(since: datetime.datetime, group_by: Literal["ip", "userAgent", "both"],
+                                  limit: int) -> list[dict]:
+    """
+    Fehlgeschlagene Logins seit since, gruppiert nach IP und/oder User-Agent, häufigste zuerst.
+    Nutzt den Index (timestamp, status).
+    """
+    group_id = {}
+    if group_by in ("ip", "both"):
+        group_id["ipAddress"] = "$ipAddress"
+    if group_by in ("userAgent", "both"):
+        group_id["userAgent"] = "$userAgent"
+
+    return await Logins.get_motor_collection().aggregate([
+        {"$match": {"timestamp": {"$gte": since}, "status": False}},
+        {"$group": {
+            "_id": group_id,
+            "attempts": {"$sum": 1},
+            "users": {"$addToSet": "$userUid"},
+            "lastAttempt": {"$max": "$timestamp"}
+        }},
+        {"$sort": {"attempts": -1, "lastAttempt": -1}},
+        {"$limit": limit},
+        {"$project": {
+            "_id": 0,
+            "ipAddress": "$_id.ipAddress",
+            "userAgent": "$_id.userAgent",
+            "attempts": 1,
+            "users": {"$size": "$users"},
+            "lastAttempt": 1
+        }}
+    ], allowDiskUse=True).to_list(limit)
+
+
+async def get_login_histogram(interval: Literal["hour", "day"], since: datetime.datetime, until: datetime.datetime,
+                              user_uid: str | None = None) -> list[dict]:
+    """
+    Erfolgreiche und fehlgeschlagene Logins pro Stunde bzw. Tag im Zeitraum [since, until).
+    """
+    match: dict = {"timestamp": {"$gte": since, "$lt": until}}
+    if user_uid:
+        match["userUid"] = user_uid
+
+    return await Logins.get_motor_collection().aggregate([
+        {"$match": match},
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$timestamp", "unit": interval}},
+            "success": {"$sum": {"$cond": ["$status", 1, 0]}},
+            "failed": {"$sum": {"$cond": ["$status", 0, 1]}}
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "start": "$_id", "success": 1, "failed": 1}}
+    ]).to_list(None)
@@ -0,0 +1,30 @@
+import time
+from application.modules.utils.cache import TTLCache
+from application.modules.utils.settings import get_settings
+
+# Dekodierte JWT-Payloads (Schlüssel: Token) und aufgelöste User-Dokumente (Schlüssel: uid);
+# Größe und Ablaufzeit folgen den aktuellen Settings
+token_cache = TTLCache(lambda: get_settings().AUTH_CACHE_MAX_SIZE, lambda: get_settings().AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(lambda: get_settings().AUTH_CACHE_MAX_SIZE, lambda: get_settings().AUTH_CACHE_TTL_SECONDS)
+
+
+def cache_token_payload(token: str, payload: dict):
+    expires_at = payload.get("exp")
+    ttl = expires_at - time.time() if isinstance(expires_at, (int, float)) else None
+    token_cache.set(token, payload, ttl)
+
+
+def invalidate_user(uid: str):
+    """
+    Entfernt einen Benutzer aus dem Cache, damit Änderungen (Deaktivierung, Rolle, Löschung)
+    sofort beim nächsten Request greifen. Andere Worker verwerfen ihren Eintrag über die Token-Sperre
+    (siehe revocation.load_revocations).
+    """
+    user_cache.invalidate(uid)
+
+
+def get_auth_cache_stats() -> dict:
+    return {
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+    }
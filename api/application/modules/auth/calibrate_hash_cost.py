@@ -0,0 +1,50 @@
+"""
+Ermittelt die bcrypt-Kosten (Rounds), die auf diesem Host eine Ziel-Latenz pro Hash einhalten.
+
+    python -m application.modules.auth.calibrate_hash_cost --target-ms 250
+
+Der empfohlene Wert wird als PASSWORD_HASH_ROUNDS in der .env hinterlegt. Bestehende Hashes
+mit niedrigeren Kosten werden beim nächsten erfolgreichen Login automatisch neu erzeugt.
+"""
+import argparse
+import secrets
+from time import perf_counter
+import bcrypt
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure_rounds(rounds: int, samples: int) -> float:
+    password = secrets.token_urlsafe(16).encode()
+    durations = []
+    for _ in range(samples):
+        start = perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        durations.append((perf_counter() - start) * 1000)
+    return sorted(durations)[len(durations) // 2]
+
+
+def calibrate(target_ms: float, samples: int) -> int:
+    chosen = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        duration = measure_rounds(rounds, samples)
+        print(f"rounds={rounds:<3} {duration:>9.1f} ms")
+        if duration > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt-Kosten für eine Ziel-Latenz kalibrieren")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms, args.samples)
+    print(f"\nEmpfehlung: PASSWORD_HASH_ROUNDS={rounds}")
+
+
+if __name__ == '__main__':
+    main()
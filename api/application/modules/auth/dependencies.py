@@ -2,18 +2,37 @@ from typing import Union, List
 from fastapi import Depends
 from jose import jwt, JWTError
 from starlette import status
+from application.modules.auth.cache import token_cache, user_cache, cache_token_payload
+from application.modules.auth.presence import record_activity
+from application.modules.auth.revocation import is_token_revoked
 from application.modules.auth.service import oauth2_scheme
 from application.modules.database.database_models import User, UserRole
 from application.modules.schemas.response_schemas import GeneralException
+from application.modules.schemas.schemas import TokenPrincipal
 from application.modules.utils.settings import get_settings
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+def _decode_token(token: str) -> dict:
     settings = get_settings()
 
-    try:
+    payload = token_cache.get(token)
+    if payload is None:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user = await User.find_one(User.uid == payload.get('uid'))
+        cache_token_payload(token, payload)
+    return payload
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    try:
+        payload = _decode_token(token)
+
+        uid = payload.get('uid')
+        user = user_cache.get(uid)
+        if user is None:
+            user = await User.find_one(User.uid == uid)
+            if user:
+                user_cache.set(uid, user)
+
         if not user or not user.isActive:
             raise GeneralException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,9 +49,39 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             is_ok=False
         )
 
+    record_activity(user.uid)
     return user
 
 
+def get_token_principal(token: str) -> TokenPrincipal | None:
+    """
+    Autorisiert ausschließlich anhand der Token-Claims (AUTH_STATELESS), ohne Datenbankzugriff.
+    Gibt None zurück, wenn das Token noch keine Rollen-/Versions-Claims enthält.
+    """
+    try:
+        payload = _decode_token(token)
+    except JWTError:
+        raise GeneralException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            status="UNAUTHORIZED",
+            exception="Token is invalid.",
+            is_ok=False
+        )
+
+    if "lvl" not in payload or "ver" not in payload:
+        return None
+
+    if is_token_revoked(payload.get("uid"), payload["ver"]):
+        raise GeneralException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            status="UNAUTHORIZED",
+            exception="Token has been revoked.",
+            is_ok=False
+        )
+
+    return TokenPrincipal(uid=payload.get("uid"), role=payload.get("role", ""), level=payload["lvl"])
+
+
 def require_role(required_roles: Union[str, UserRole, List[Union[str, UserRole]]]):
     if not isinstance(required_roles, list):
         required_roles = [required_roles]
@@ -52,21 +101,16 @@ def require_role(required_roles: Union[str, UserRole, List[Union[str, UserRole]]
 
     min_required_level = max(role.level for role in resolved_roles)
 
-    async def checker(user: User = Depends(get_current_user)):
+    async def checker(token: str = Depends(oauth2_scheme)):
+        principal = get_token_principal(token) if get_settings().AUTH_STATELESS else None
+        if principal is None:
+            principal = await get_current_user(token)
+            level = UserRole.from_label(principal.role).level
+        else:
+            level = principal.level
+            record_activity(principal.uid)
 
-        try:
-            role_enum = UserRole.viewer
-            for role in UserRole:
-                if str(role) == user.role:
-                    role_enum = UserRole(role)
-        except ValueError:
-            raise GeneralException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                status="FORBIDDEN",
-                exception=f"Ungültige Rolle im Benutzerobjekt: {user.role}",
-                is_ok=False
-            )
-        if role_enum.level < min_required_level:
+        if level < min_required_level:
             raise GeneralException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 status="FORBIDDEN",
@@ -74,6 +118,6 @@ def require_role(required_roles: Union[str, UserRole, List[Union[str, UserRole]]
                 is_ok=False
             )
 
-        return user
+        return principal
 
     return checker
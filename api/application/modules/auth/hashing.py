@@ -0,0 +1,140 @@
+import asyncio
+import secrets
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, TypeVar
+from starlette import status
+from application.modules.auth.security import hash_password, pwd_context
+from application.modules.auth.service import verify_password
+from application.modules.schemas.response_schemas import GeneralException
+from application.modules.utils.settings import get_settings
+
+T = TypeVar("T")
+
+_settings = get_settings()
+_max_workers = _settings.PASSWORD_HASH_WORKERS
+_max_in_flight = _settings.PASSWORD_HASH_WORKERS + _settings.PASSWORD_HASH_QUEUE_LIMIT
+
+_executor: ThreadPoolExecutor | None = None
+_in_flight = 0
+_completed = 0
+_rejected = 0
+_latencies_ms: deque[float] = deque(maxlen=2048)
+_queue_waits_ms: deque[float] = deque(maxlen=2048)
+_dummy_hash: str | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="cortexui-hash")
+    return _executor
+
+
+async def run_in_hash_pool(func: Callable[..., T], *args) -> T:
+    """
+    Führt eine bcrypt-Operation im begrenzten Hashing-Pool aus, damit der Event-Loop frei bleibt.
+    Sind alle Worker belegt und die Warteschlange voll, wird sofort mit 503 abgelehnt.
+    """
+    global _in_flight, _completed, _rejected
+
+    if _in_flight >= _max_in_flight:
+        _rejected += 1
+        raise GeneralException(
+            is_ok=False,
+            status="HASHING_OVERLOADED",
+            exception="Der Server ist aktuell ausgelastet, bitte versuchen Sie es in Kürze erneut.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    submitted = perf_counter()
+    started: list[float] = []
+
+    def timed():
+        started.append(perf_counter())
+        return func(*args)
+
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), timed)
+    finally:
+        _in_flight -= 1
+        _completed += 1
+        _latencies_ms.append((perf_counter() - submitted) * 1000)
+        if started:
+            _queue_waits_ms.append((started[0] - submitted) * 1000)
+
+
+async def start_hash_pool():
+    """
+    Legt den Hashing-Pool und den Dummy-Hash für unbekannte Benutzer beim Start an, damit schon der erste
+    Login-Versuch mit unbekannter E-Mail genau eine Hash-Berechnung kostet.
+    """
+    global _dummy_hash
+    _get_executor()
+    if _dummy_hash is None:
+        _dummy_hash = await run_in_hash_pool(hash_password, secrets.token_urlsafe(16))
+
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_login_password(plain_password: str, hashed_password: str | None) -> tuple[bool, str | None]:
+    """
+    Prüft ein Login-Passwort mit genau einer Hash-Berechnung pro Versuch.
+    Für unbekannte Benutzer wird gegen einen Dummy-Hash geprüft, damit die Antwortzeit gleich bleibt.
+    Gibt zusätzlich einen neuen Hash zurück, falls der gespeicherte mit veralteten Kosten erzeugt wurde.
+    """
+    if hashed_password is None:
+        if _dummy_hash is None:
+            # Nur ohne Lifespan (z.B. CLI), im Serverbetrieb legt start_hash_pool den Hash beim Start an
+            await start_hash_pool()
+        await run_in_hash_pool(pwd_context.verify, plain_password, _dummy_hash)
+        return False, None
+
+    try:
+        return await run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+    except ValueError:
+        return False, None
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 2)
+
+
+def get_hashing_stats() -> dict:
+    latencies = list(_latencies_ms)
+    waits = list(_queue_waits_ms)
+    return {
+        "workers": _max_workers,
+        "maxInFlight": _max_in_flight,
+        "inFlight": _in_flight,
+        "completed": _completed,
+        "rejected": _rejected,
+        "latencyMs": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+        },
+        "queueWaitMs": {
+            "p50": _percentile(waits, 50),
+            "p99": _percentile(waits, 99),
+        },
+    }
+
+
+def shutdown_hash_pool():
+    global _executor
+    if _executor:
+        _executor.shutdown(wait=True)
+        _executor = None
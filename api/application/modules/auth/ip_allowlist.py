@@ -0,0 +1,48 @@
+import ipaddress
+from typing import Iterable
+
+
+class IpAllowlist:
+    """
+    Einmalig kompilierte IP-/CIDR-Allowlist. Netze werden pro IP-Version und Präfixlänge als
+    Menge von Netzwerkpräfixen abgelegt, eine Prüfung kostet damit nur einen Set-Lookup pro Präfixlänge.
+    """
+
+    def __init__(self, entries: Iterable[str]):
+        self._prefixes: dict[int, dict[int, set[int]]] = {4: {}, 6: {}}
+
+        for entry in entries:
+            try:
+                network = ipaddress.ip_network(entry.strip(), strict=False)
+            except ValueError:
+                continue
+            shift = network.max_prefixlen - network.prefixlen
+            self._prefixes[network.version].setdefault(network.prefixlen, set()).add(
+                int(network.network_address) >> shift
+            )
+
+    def __contains__(self, ip: str) -> bool:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+
+        value = int(address)
+        max_prefixlen = address.max_prefixlen
+        for prefixlen, prefixes in self._prefixes[address.version].items():
+            if value >> (max_prefixlen - prefixlen) in prefixes:
+                return True
+        return False
+
+
+def validate_allowlist(entries: Iterable[str]) -> list[str]:
+    """
+    Prüft, ob alle Einträge gültige IP-Adressen oder CIDR-Netze sind (wirft sonst ValueError).
+    """
+    cleaned = [entry.strip() for entry in entries if entry.strip()]
+    for entry in cleaned:
+        ipaddress.ip_network(entry, strict=False)
+    return cleaned
@@ -1,14 +1,111 @@
+import asyncio
 from starlette.requests import Request
 import datetime
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError
+from application.modules.auth.login_stats import record_login_stats
+from application.modules.auth.rate_limit import get_client_ip
 from application.modules.database.database_models import Logins, LoginStatus
+from application.modules.utils.background import start_periodic_task
+from application.modules.utils.logger import get_logger
+from application.modules.utils.settings import get_settings
+
+# Gepufferte Login-Einträge, werden gebündelt per insert_many geschrieben
+_buffer: list[dict] = []
+_flush_lock = asyncio.Lock()
+_flush_task: asyncio.Task | None = None
+_stats = {"written": 0, "flushes": 0, "failedFlushes": 0, "backpressureWaits": 0, "dropped": 0}
+
+
+def _write_concern() -> WriteConcern:
+    w = get_settings().LOGIN_LOG_WRITE_CONCERN
+    return WriteConcern(w=int(w) if w.isdigit() else w)
+
+
+def _requeue(records: list[dict]):
+    max_buffer = get_settings().LOGIN_LOG_MAX_BUFFER
+    _buffer[:0] = records
+    if len(_buffer) > max_buffer:
+        overflow = len(_buffer) - max_buffer
+        del _buffer[:overflow]
+        _stats["dropped"] += overflow
+        get_logger('auth').warning(f"⚠️ Login-Puffer voll – {overflow} älteste Einträge verworfen")
+
+
+async def flush_login_attempts():
+    """
+    Schreibt alle gepufferten Login-Einträge in Batches von LOGIN_LOG_BATCH_SIZE. Nicht geschriebene
+    Einträge werden bei Fehlern wieder vorne in den Puffer gestellt.
+    """
+    global _buffer
+    async with _flush_lock:
+        batch_size = get_settings().LOGIN_LOG_BATCH_SIZE
+        collection = Logins.get_motor_collection().with_options(write_concern=_write_concern())
+
+        while _buffer:
+            batch, _buffer = _buffer[:batch_size], _buffer[batch_size:]
+            failed = []
+            try:
+                await collection.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Duplikate stammen aus einem bereits teilweise geschriebenen Batch und gelten als geschrieben
+                failed = sorted({
+                    error["index"] for error in e.details.get("writeErrors", []) if error.get("code") != 11000
+                })
+                if failed:
+                    _stats["failedFlushes"] += 1
+                    _requeue([batch[index] for index in failed])
+            except Exception:
+                _stats["failedFlushes"] += 1
+                _requeue(batch)
+                raise
+
+            written = [record for index, record in enumerate(batch) if index not in failed]
+            _stats["written"] += len(written)
+            _stats["flushes"] += 1
+            try:
+                await record_login_stats(written)
+            except Exception as e:
+                get_logger('auth').error(f"❌ LoginStats konnten nicht aktualisiert werden: {e}")
+
+            if failed:
+                raise RuntimeError(f"{len(failed)} Login-Einträge konnten nicht geschrieben werden")
+
+
+async def _flush_in_background():
+    try:
+        await flush_login_attempts()
+    except Exception as e:
+        get_logger('auth').error(f"❌ Login-Einträge konnten nicht geschrieben werden: {e}")
 
 
 async def log_login_attempt(request: Request, user_uid: str, login_status: LoginStatus):
-    log = Logins(
-        userUid=user_uid,
-        timestamp=datetime.datetime.now(),
-        ipAddress=request.headers.get("x-forwarded-for", request.client.host),
-        userAgent=request.headers.get("user-agent", "unknown"),
-        status=login_status
-    )
-    await log.create()
\ No newline at end of file
+    global _flush_task
+    settings = get_settings()
+
+    if len(_buffer) >= settings.LOGIN_LOG_MAX_BUFFER:
+        # Backpressure: ist der Puffer voll, wartet der Aufrufer, bis geschrieben wurde
+        _stats["backpressureWaits"] += 1
+        await flush_login_attempts()
+
+    _buffer.append({
+        "userUid": user_uid,
+        "timestamp": datetime.datetime.now(),
+        "ipAddress": get_client_ip(request),
+        "userAgent": request.headers.get("user-agent", "unknown"),
+        "status": login_status.value
+    })
+
+    if len(_buffer) >= settings.LOGIN_LOG_BATCH_SIZE and (_flush_task is None or _flush_task.done()):
+        _flush_task = asyncio.create_task(_flush_in_background())
+
+
+def start_login_log_writer():
+    start_periodic_task("login-log-writer", get_settings().LOGIN_LOG_FLUSH_SECONDS, flush_login_attempts)
+
+
+def get_login_log_stats() -> dict:
+    return {
+        **_stats,
+        "buffered": len(_buffer),
+    }
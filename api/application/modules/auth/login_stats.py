@@ -0,0 +1,121 @@
+"""
+Tages-Rollups der Login-Versuche (gesamt und pro Benutzer) in der LoginStats-Collection.
+
+Die Zähler werden beim Schreiben der Login-Einträge per $inc fortgeschrieben. Neu aufbauen aus den
+vorhandenen Logins-Daten:
+
+    python -m application.modules.auth.login_stats --since 2025-01-01
+"""
+import argparse
+import asyncio
+import datetime
+from pymongo import UpdateOne, ReplaceOne
+from application.modules.database.database_models import Logins, LoginStats
+from application.modules.utils.logger import get_logger
+from application.modules.utils.settings import get_settings
+
+# userUid der Tageszeile über alle Benutzer
+ALL_USERS = "*"
+
+
+def _day(timestamp: datetime.datetime) -> str:
+    return timestamp.strftime("%Y-%m-%d")
+
+
+async def record_login_stats(records: list[dict]):
+    """
+    Fasst die Login-Einträge eines Batches pro (Tag, Benutzer) zusammen und schreibt sie als $inc-Upserts.
+    """
+    rollups: dict[tuple[str, str], dict] = {}
+    for record in records:
+        field, last_field = ("success", "lastSuccessAt") if record["status"] else ("failed", "lastFailedAt")
+        for uid in (record["userUid"], ALL_USERS):
+            rollup = rollups.setdefault((_day(record["timestamp"]), uid), {"$inc": {}, "$max": {}})
+            rollup["$inc"][field] = rollup["$inc"].get(field, 0) + 1
+            rollup["$max"][last_field] = max(record["timestamp"], rollup["$max"].get(last_field, record["timestamp"]))
+
+    if rollups:
+        await LoginStats.get_motor_collection().bulk_write([
+            UpdateOne({"day": day, "userUid": uid}, update, upsert=True) for (day, uid), update in rollups.items()
+        ], ordered=False)
+
+
+async def get_day_stats(day: datetime.date, user_uid: str = ALL_USERS) -> LoginStats | None:
+    return await LoginStats.find_one(LoginStats.day == day.strftime("%Y-%m-%d"), LoginStats.userUid == user_uid)
+
+
+async def get_last_successful_login(user_uid: str) -> datetime.datetime | None:
+    stats = await LoginStats.find_one(
+        LoginStats.userUid == user_uid, LoginStats.success > 0, sort=[("day", -1)]
+    )
+    return stats.lastSuccessAt if stats else None
+
+
+async def backfill_login_stats(since: datetime.datetime | None = None, batch_size: int = 1000) -> int:
+    """
+    Baut die Rollups aus den Logins-Daten neu auf (ab since bzw. vollständig) und ersetzt vorhandene Zähler.
+    Für den aktuellen Tag sollte der Lauf in einer ruhigen Phase erfolgen, da parallele $inc-Updates überschrieben werden.
+    """
+    pipeline = [{"$match": {"timestamp": {"$gte": since}}}] if since else []
+    pipeline.append({
+        "$group": {
+            "_id": {
+                "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
+                "userUid": "$userUid"
+            },
+            "success": {"$sum": {"$cond": ["$status", 1, 0]}},
+            "failed": {"$sum": {"$cond": ["$status", 0, 1]}},
+            "lastSuccessAt": {"$max": {"$cond": ["$status", "$timestamp", None]}},
+            "lastFailedAt": {"$max": {"$cond": ["$status", None, "$timestamp"]}}
+        }
+    })
+
+    rollups: dict[tuple[str, str], dict] = {}
+    async for group in Logins.get_motor_collection().aggregate(pipeline, allowDiskUse=True):
+        day, uid = group["_id"]["day"], group["_id"]["userUid"]
+        rollups[(day, uid)] = {key: group[key] for key in ("success", "failed", "lastSuccessAt", "lastFailedAt")}
+
+        total = rollups.setdefault((day, ALL_USERS), {"success": 0, "failed": 0, "lastSuccessAt": None, "lastFailedAt": None})
+        total["success"] += group["success"]
+        total["failed"] += group["failed"]
+        for key in ("lastSuccessAt", "lastFailedAt"):
+            if group[key] and (total[key] is None or group[key] > total[key]):
+                total[key] = group[key]
+
+    collection = LoginStats.get_motor_collection()
+    if since:
+        await collection.delete_many({"day": {"$gte": _day(since)}})
+    else:
+        await collection.delete_many({})
+
+    operations = [
+        ReplaceOne({"day": day, "userUid": uid}, {"day": day, "userUid": uid, **counters}, upsert=True)
+        for (day, uid), counters in rollups.items()
+    ]
+    for start in range(0, len(operations), batch_size):
+        await collection.bulk_write(operations[start:start + batch_size], ordered=False)
+    return len(operations)
+
+
+async def _run_backfill(since: datetime.datetime | None):
+    from application.modules.database.connection import init_db
+
+    logger = get_logger('database')
+    await init_db(logger, get_settings())
+    written = await backfill_login_stats(since)
+    logger.info(f"📊 {written} LoginStats-Einträge neu aufgebaut")
+    print(f"{written} LoginStats-Einträge neu aufgebaut")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LoginStats-Rollups aus den Logins-Daten neu aufbauen")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, default=None,
+                        help="Nur Tage ab diesem Datum (YYYY-MM-DD) neu aufbauen")
+    args = parser.parse_args()
+
+    since = datetime.datetime.combine(args.since, datetime.time.min) if args.since else None
+    asyncio.run(_run_backfill(since))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import datetime
+from pymongo import UpdateOne
+from application.modules.database.database_models import User
+from application.modules.utils.background import start_periodic_task
+from application.modules.utils.settings import get_settings
+
+# Letzte Aktivität je Benutzer (nur im Speicher, Grundlage für "jetzt online")
+_last_activity: dict[str, datetime.datetime] = {}
+# Noch nicht geschriebene lastSeen-Werte, je Benutzer zusammengefasst
+_pending: dict[str, datetime.datetime] = {}
+# Zuletzt geschriebener lastSeen-Wert je Benutzer, begrenzt die Schreibrate
+_last_written: dict[str, datetime.datetime] = {}
+_stats = {"recorded": 0, "written": 0, "flushes": 0, "failedFlushes": 0}
+
+
+def record_activity(uid: str):
+    """
+    Merkt die Aktivität eines Benutzers vor. Geschrieben wird höchstens alle PRESENCE_WRITE_INTERVAL_SECONDS
+    pro Benutzer, gebündelt durch flush_presence.
+    """
+    now = datetime.datetime.now()
+    _last_activity[uid] = now
+    _stats["recorded"] += 1
+
+    last_written = _last_written.get(uid)
+    if last_written is None or (now - last_written).total_seconds() >= get_settings().PRESENCE_WRITE_INTERVAL_SECONDS:
+        _pending[uid] = now
+
+
+def _prune(now: datetime.datetime):
+    # Einträge, die weder online zählen noch die Schreibrate begrenzen, werden nicht mehr benötigt
+    settings = get_settings()
+    horizon = max(settings.PRESENCE_ONLINE_SECONDS, settings.PRESENCE_WRITE_INTERVAL_SECONDS)
+    for uid, seen_at in list(_last_activity.items()):
+        if (now - seen_at).total_seconds() > horizon and uid not in _pending:
+            del _last_activity[uid]
+            _last_written.pop(uid, None)
+
+
+async def flush_presence():
+    global _pending
+    now = datetime.datetime.now()
+    if _pending:
+        pending, _pending = _pending, {}
+        try:
+            await User.get_motor_collection().bulk_write(
+                [UpdateOne({"uid": uid}, {"$max": {"lastSeen": seen_at}}) for uid, seen_at in pending.items()],
+                ordered=False
+            )
+        except Exception:
+            _stats["failedFlushes"] += 1
+            for uid, seen_at in pending.items():
+                _pending[uid] = max(seen_at, _pending.get(uid, seen_at))
+            raise
+
+        _last_written.update(pending)
+        _stats["written"] += len(pending)
+        _stats["flushes"] += 1
+
+    _prune(now)
+
+
+def start_presence_tracker():
+    start_periodic_task("presence", get_settings().PRESENCE_FLUSH_SECONDS, flush_presence)
+
+
+def get_online_count() -> int:
+    """
+    Benutzer mit Aktivität in den letzten PRESENCE_ONLINE_SECONDS (pro API-Prozess).
+    """
+    since = datetime.datetime.now() - datetime.timedelta(seconds=get_settings().PRESENCE_ONLINE_SECONDS)
+    return sum(1 for seen_at in _last_activity.values() if seen_at >= since)
+
+
+def get_presence_stats() -> dict:
+    return {
+        **_stats,
+        "online": get_online_count(),
+        "tracked": len(_last_activity),
+        "pendingUpdates": len(_pending),
+    }
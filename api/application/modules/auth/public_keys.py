@@ -0,0 +1,107 @@
+import datetime
+import hashlib
+from pymongo import UpdateOne
+from application.modules.auth.ip_allowlist import IpAllowlist
+from application.modules.database.database_models import PublicKeys
+from application.modules.utils.background import start_periodic_task
+from application.modules.utils.cache import TTLCache
+from application.modules.utils.logger import get_logger
+from application.modules.utils.settings import get_settings
+
+# SHA-256 des Schlüssels -> (PublicKeys-Dokument, kompilierte Allowlist); False für unbekannte/inaktive Schlüssel
+key_cache = TTLCache(
+    lambda: get_settings().PUBLIC_KEY_CACHE_MAX_SIZE, lambda: get_settings().PUBLIC_KEY_CACHE_TTL_SECONDS
+)
+
+# uid -> letzter Nutzungszeitpunkt, wird gebündelt per bulk_write geschrieben
+_pending_usage: dict[str, datetime.datetime] = {}
+
+
+def hash_public_key(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def mask_public_key(key: str) -> str:
+    """
+    Anzeigewert für die Oberfläche – der vollständige Schlüssel wird nur beim Anlegen einmalig ausgegeben.
+    """
+    return f"{key[:10]}…{key[-4:]}" if len(key) > 14 else "…"
+
+
+async def find_active_public_key(key: str) -> tuple[PublicKeys, IpAllowlist | None] | None:
+    key_hash = hash_public_key(key)
+
+    entry = key_cache.get(key_hash)
+    if entry is None:
+        db_key = await PublicKeys.find_one(PublicKeys.keyHash == key_hash, PublicKeys.isActive == True)
+        entry = (db_key, IpAllowlist(db_key.allowedIps) if db_key.allowedIps else None) if db_key else False
+        key_cache.set(key_hash, entry)
+    return entry or None
+
+
+def invalidate_public_keys():
+    """
+    Leert den Cache nach Änderungen an Public Keys (Anlegen, Aktivieren/Deaktivieren, Löschen).
+    """
+    key_cache.clear()
+
+
+async def migrate_plaintext_public_keys(batch_size: int = 500):
+    """
+    Ersetzt Klartext-Schlüssel aus älteren Versionen batchweise durch SHA-256-Digest und Anzeigewert.
+    Idempotent – bereits migrierte Dokumente werden übersprungen.
+    """
+    logger = get_logger('database')
+    collection = PublicKeys.get_motor_collection()
+    migrated = 0
+
+    while True:
+        batch = await collection.find(
+            {"keyHash": {"$exists": False}, "key": {"$type": "string"}},
+            {"_id": 1, "key": 1}
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        await collection.bulk_write([
+            UpdateOne(
+                {"_id": document["_id"]},
+                {"$set": {"keyHash": hash_public_key(document["key"]), "key": mask_public_key(document["key"])}}
+            ) for document in batch
+        ], ordered=False)
+        migrated += len(batch)
+
+    if migrated:
+        logger.info(f"🔑 {migrated} Public Keys auf SHA-256-Digest migriert")
+
+
+def record_key_usage(uid: str):
+    _pending_usage[uid] = datetime.datetime.now()
+
+
+async def flush_key_usage():
+    global _pending_usage
+    if not _pending_usage:
+        return
+
+    pending, _pending_usage = _pending_usage, {}
+    try:
+        await PublicKeys.get_motor_collection().bulk_write(
+            [UpdateOne({"uid": uid}, {"$max": {"lastUsedAt": used_at}}) for uid, used_at in pending.items()],
+            ordered=False
+        )
+    except Exception:
+        for uid, used_at in pending.items():
+            _pending_usage[uid] = max(used_at, _pending_usage.get(uid, used_at))
+        raise
+
+
+def start_key_usage_flusher():
+    start_periodic_task("public-key-usage", get_settings().PUBLIC_KEY_USAGE_FLUSH_SECONDS, flush_key_usage)
+
+
+def get_public_key_cache_stats() -> dict:
+    return {
+        **key_cache.stats(),
+        "pendingUsageUpdates": len(_pending_usage),
+    }
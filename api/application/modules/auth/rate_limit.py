@@ -0,0 +1,211 @@
+import datetime
+import math
+import time
+import zlib
+from typing import Literal
+from pymongo import ReturnDocument
+from starlette import status
+from starlette.requests import Request
+from application.modules.auth.ip_allowlist import IpAllowlist
+from application.modules.database.database_models import RateLimitCounter
+from application.modules.schemas.response_schemas import GeneralException
+from application.modules.utils.background import start_periodic_task
+from application.modules.utils.settings import get_settings
+
+RateLimitScope = Literal["login-ip", "login-email", "public-key"]
+
+_SHARD_COUNT = 16
+
+
+class _WindowCounter:
+    __slots__ = ("window", "index", "current", "previous")
+
+    def __init__(self, window: int, index: int):
+        self.window = window
+        self.index = index
+        self.current = 0
+        self.previous = 0
+
+    def roll(self, index: int):
+        if index == self.index:
+            return
+        self.previous = self.current if index == self.index + 1 else 0
+        self.current = 0
+        self.index = index
+
+
+# Sliding-Window-Zähler, nach Schlüssel auf mehrere Shards verteilt, damit das Aufräumen klein bleibt
+_shards: list[dict[str, _WindowCounter]] = [{} for _ in range(_SHARD_COUNT)]
+_stats: dict[str, dict[str, int]] = {}
+_trusted_proxies_cache: tuple[str, IpAllowlist] | None = None
+
+
+def _rule(scope: RateLimitScope) -> tuple[int, int]:
+    settings = get_settings()
+    return {
+        "login-ip": (settings.RATE_LIMIT_LOGIN_PER_IP, settings.RATE_LIMIT_LOGIN_IP_WINDOW_SECONDS),
+        "login-email": (settings.RATE_LIMIT_LOGIN_FAILURES_PER_EMAIL, settings.RATE_LIMIT_LOGIN_EMAIL_WINDOW_SECONDS),
+        "public-key": (settings.RATE_LIMIT_PUBLIC_KEY, settings.RATE_LIMIT_PUBLIC_KEY_WINDOW_SECONDS),
+    }[scope]
+
+
+def _estimate(previous: int, current: int, elapsed: float, window: int) -> float:
+    return previous * (1 - elapsed / window) + current
+
+
+def _retry_after(previous: int, current: int, elapsed: float, window: int, limit: int) -> int:
+    if current >= limit or previous == 0:
+        return max(1, math.ceil(window - elapsed))
+    # Zeitpunkt, ab dem der gewichtete Anteil des vorherigen Fensters unter das Limit fällt
+    release_at = window * (1 - (limit - current) / previous)
+    return max(1, math.ceil(release_at - elapsed))
+
+
+def _memory_counts(bucket: str, window: int, index: int, increment: bool) -> tuple[int, int]:
+    shard = _shards[zlib.crc32(bucket.encode()) % _SHARD_COUNT]
+    counter = shard.get(bucket)
+    if counter is None:
+        if not increment:
+            return 0, 0
+        counter = shard[bucket] = _WindowCounter(window, index)
+
+    counter.roll(index)
+    if increment:
+        counter.current += 1
+    return counter.previous, counter.current
+
+
+async def _mongo_counts(bucket: str, window: int, index: int, increment: bool) -> tuple[int, int]:
+    collection = RateLimitCounter.get_motor_collection()
+    current = 0
+
+    if increment:
+        document = await collection.find_one_and_update(
+            {"_id": f"{bucket}:{index}"},
+            {
+                "$inc": {"hits": 1},
+                # Der TTL-Monitor von MongoDB wertet expiresAt in UTC aus
+                "$setOnInsert": {
+                    "expiresAt": datetime.datetime.fromtimestamp((index + 2) * window, datetime.timezone.utc)
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        current = document["hits"]
+
+    ids = [f"{bucket}:{index - 1}"] + ([] if increment else [f"{bucket}:{index}"])
+    counts = {document["_id"]: document["hits"] async for document in collection.find({"_id": {"$in": ids}})}
+    if not increment:
+        current = counts.get(f"{bucket}:{index}", 0)
+    return counts.get(f"{bucket}:{index - 1}", 0), current
+
+
+async def _counts(bucket: str, window: int, index: int, increment: bool) -> tuple[int, int]:
+    if get_settings().RATE_LIMIT_BACKEND == "mongo":
+        return await _mongo_counts(bucket, window, index, increment)
+    return _memory_counts(bucket, window, index, increment)
+
+
+async def enforce_rate_limit(scope: RateLimitScope, key: str, record: bool = True):
+    """
+    Lehnt die Anfrage mit 429 und Retry-After ab, sobald der Schlüssel sein Limit im gleitenden Fenster
+    erreicht hat. Mit record=False wird nur geprüft; gezählt wird dann später über record_rate_limit().
+    """
+    if not get_settings().RATE_LIMIT_ENABLED:
+        return
+
+    limit, window = _rule(scope)
+    now = time.time()
+    index, elapsed = int(now // window), now % window
+    previous, current = await _counts(f"{scope}:{key}", window, index, increment=record)
+
+    stats = _stats.setdefault(scope, {"allowed": 0, "blocked": 0})
+    used = _estimate(previous, current - 1 if record else current, elapsed, window)
+    if used >= limit:
+        stats["blocked"] += 1
+        raise GeneralException(
+            is_ok=False,
+            status="TOO_MANY_REQUESTS",
+            exception="Zu viele Anfragen, bitte versuchen Sie es später erneut.",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(_retry_after(previous, current, elapsed, window, limit))}
+        )
+    stats["allowed"] += 1
+
+
+async def record_rate_limit(scope: RateLimitScope, key: str):
+    if not get_settings().RATE_LIMIT_ENABLED:
+        return
+
+    _limit, window = _rule(scope)
+    now = time.time()
+    await _counts(f"{scope}:{key}", window, int(now // window), increment=True)
+
+
+def _trusted_proxies() -> IpAllowlist:
+    global _trusted_proxies_cache
+    entries = get_settings().TRUSTED_PROXIES
+    if _trusted_proxies_cache is None or _trusted_proxies_cache[0] != entries:
+        _trusted_proxies_cache = (entries, IpAllowlist(entries.split(",")))
+    return _trusted_proxies_cache[1]
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    Adresse des Clients. X-Forwarded-For wird nur ausgewertet, wenn die Verbindung von einem Proxy aus
+    TRUSTED_PROXIES kommt; dann gilt der rechteste Eintrag, der selbst kein vertrauenswürdiger Proxy ist.
+    Die linken Einträge setzt der Client selbst und werden nie ungeprüft übernommen.
+    """
+    peer = request.client.host if request.client else ""
+    trusted = _trusted_proxies()
+    if peer not in trusted:
+        return peer
+
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted:
+            return hop
+    return hops[0] if hops else peer
+
+
+async def cleanup_rate_limits():
+    now = time.time()
+    for shard in _shards:
+        stale = [bucket for bucket, counter in shard.items() if counter.index < int(now // counter.window) - 1]
+        for bucket in stale:
+            del shard[bucket]
+
+
+def start_rate_limit_cleanup():
+    start_periodic_task("rate-limit-cleanup", 60, cleanup_rate_limits)
+
+
+def get_rate_limit_stats(top: int = 10) -> dict:
+    now = time.time()
+    hot_keys: dict[str, list[tuple[str, float]]] = {}
+
+    for shard in _shards:
+        for bucket, counter in shard.items():
+            scope, _, key = bucket.partition(":")
+            index, elapsed = int(now // counter.window), now % counter.window
+            previous = counter.previous if counter.index == index else (counter.current if counter.index == index - 1 else 0)
+            current = counter.current if counter.index == index else 0
+            estimate = _estimate(previous, current, elapsed, counter.window)
+            if estimate >= 1:
+                hot_keys.setdefault(scope, []).append((key, round(estimate, 1)))
+
+    return {
+        "backend": get_settings().RATE_LIMIT_BACKEND,
+        "trackedKeys": sum(len(shard) for shard in _shards),
+        "scopes": {
+            scope: {
+                **_stats.get(scope, {"allowed": 0, "blocked": 0}),
+                "topKeys": [
+                    {"key": key, "requests": requests}
+                    for key, requests in sorted(hot_keys.get(scope, []), key=lambda item: item[1], reverse=True)[:top]
+                ]
+            }
+            for scope in ("login-ip", "login-email", "public-key")
+        }
+    }
@@ -0,0 +1,67 @@
+import datetime
+import hashlib
+import secrets
+from starlette import status
+from application.modules.database.database_models import RefreshToken
+from application.modules.schemas.response_schemas import GeneralException
+from application.modules.utils.logger import get_logger
+from application.modules.utils.settings import get_settings
+
+
+def _hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def issue_refresh_token(user_uid: str, family_id: str | None = None) -> str:
+    """
+    Erzeugt ein neues Refresh-Token. Gespeichert wird nur der SHA-256-Digest, der Klartext wird
+    ausschließlich an den Client ausgegeben.
+    """
+    token = secrets.token_urlsafe(48)
+    await RefreshToken(
+        tokenHash=_hash_refresh_token(token),
+        userUid=user_uid,
+        familyId=family_id or secrets.token_hex(16),
+        # TTL-Feld, von MongoDB in UTC ausgewertet
+        expiresAt=datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            days=get_settings().REFRESH_TOKEN_EXPIRE_DAYS
+        )
+    ).create()
+    return token
+
+
+async def consume_refresh_token(token: str) -> tuple[str, str]:
+    """
+    Markiert das Refresh-Token atomar als verbraucht und gibt (userUid, familyId) zurück. Das Folge-Token
+    stellt der Aufrufer erst nach Prüfung des Benutzers mit issue_refresh_token aus.
+    Wird ein bereits verbrauchtes Token erneut vorgelegt, gilt die gesamte Token-Familie als kompromittiert.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    token_hash = _hash_refresh_token(token)
+    collection = RefreshToken.get_motor_collection()
+
+    document = await collection.find_one_and_update(
+        {"tokenHash": token_hash, "usedAt": None, "expiresAt": {"$gt": now}},
+        {"$set": {"usedAt": now}}
+    )
+    if not document:
+        reused = await collection.find_one({"tokenHash": token_hash, "usedAt": {"$ne": None}}, {"familyId": 1})
+        if reused:
+            await revoke_refresh_token_family(reused["familyId"])
+            get_logger('auth').warning("⚠️ Wiederverwendetes Refresh-Token erkannt – Token-Familie widerrufen")
+        raise GeneralException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            status="UNAUTHORIZED",
+            exception="Refresh-Token ist ungültig oder abgelaufen.",
+            is_ok=False
+        )
+
+    return document["userUid"], document["familyId"]
+
+
+async def revoke_refresh_token_family(family_id: str):
+    await RefreshToken.get_motor_collection().delete_many({"familyId": family_id})
+
+
+async def revoke_refresh_tokens(user_uid: str):
+    await RefreshToken.get_motor_collection().delete_many({"userUid": user_uid})
@@ -0,0 +1,63 @@
+import datetime
+from beanie.operators import Set, Inc
+from application.modules.auth.cache import invalidate_user
+from application.modules.auth.refresh_tokens import revoke_refresh_tokens
+from application.modules.database.change_watcher import start_collection_watcher
+from application.modules.database.database_models import TokenRevocation, User
+from application.modules.utils.settings import get_settings
+
+# uid -> minimale gültige Token-Version, über alle Worker synchronisiert
+_revoked: dict[str, int] = {}
+
+
+def is_token_revoked(uid: str, token_version: int) -> bool:
+    return token_version < _revoked.get(uid, 0)
+
+
+async def load_revocations():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    revocations = await TokenRevocation.find(TokenRevocation.expiresAt > now).to_list()
+
+    global _revoked
+    revoked = {revocation.userUid: revocation.minTokenVersion for revocation in revocations}
+    # Sperren anderer Worker: zwischengespeicherte Benutzer (Rolle, Aktiv-Status) sofort verwerfen
+    for uid in revoked.keys() | _revoked.keys():
+        if revoked.get(uid) != _revoked.get(uid):
+            invalidate_user(uid)
+    _revoked = revoked
+
+
+async def revoke_user_tokens(uid: str):
+    """
+    Erhöht die Token-Version des Benutzers und macht damit alle bisher ausgestellten Access-Tokens ungültig,
+    Refresh-Tokens werden gelöscht. Die Sperre bleibt so lange bestehen, wie ein bereits ausgestelltes
+    Token maximal gültig sein kann.
+    """
+    settings = get_settings()
+
+    user = await User.find_one(User.uid == uid)
+    if user:
+        min_version = user.tokenVersion + 1
+        await user.update(Inc({User.tokenVersion: 1}))
+    else:
+        min_version = _revoked.get(uid, 0) + 1
+
+    # expiresAt steuert den TTL-Index und wird daher, wie von MongoDB ausgewertet, in UTC geschrieben
+    expires_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES or 60
+    )
+    await TokenRevocation.find_one(TokenRevocation.userUid == uid).upsert(
+        Set({
+            TokenRevocation.minTokenVersion: min_version,
+            TokenRevocation.expiresAt: expires_at,
+            TokenRevocation.updatedAt: datetime.datetime.now()
+        }),
+        on_insert=TokenRevocation(userUid=uid, minTokenVersion=min_version, expiresAt=expires_at)
+    )
+    _revoked[uid] = min_version
+    await revoke_refresh_tokens(uid)
+
+
+async def start_revocation_watcher():
+    await load_revocations()
+    start_collection_watcher(TokenRevocation, load_revocations)
@@ -4,11 +4,21 @@ from jose import jwt
 from passlib.context import CryptContext
 from starlette import status
 from starlette.requests import Request
-from application.modules.database.database_models import PublicKeys
+from application.modules.auth.public_keys import find_active_public_key, record_key_usage, hash_public_key
+from application.modules.auth.rate_limit import enforce_rate_limit, get_client_ip
+from application.modules.database.database_models import User, UserRole
 from application.modules.schemas.response_schemas import GeneralException
 from application.modules.utils.settings import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_settings = get_settings()
+
+# min_rounds sorgt dafür, dass Hashes mit veralteten (niedrigeren) Kosten beim Login neu erzeugt werden
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=_settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=_settings.PASSWORD_HASH_ROUNDS
+)
 
 
 def create_access_token(data: dict, expires_delta: Union[int, datetime.timedelta] = None) -> str:
@@ -16,18 +26,34 @@ def create_access_token(data: dict, expires_delta: Union[int, datetime.timedelta
 
     to_encode = data.copy()
 
+    # python-jose wertet exp als UTC aus; gleiche Uhr wie das TTL-Feld der Token-Sperren (revocation.py)
+    now = datetime.datetime.now(datetime.timezone.utc)
     if isinstance(expires_delta, int):
-        expire = datetime.datetime.now() + datetime.timedelta(minutes=expires_delta)
+        expire = now + datetime.timedelta(minutes=expires_delta)
     elif isinstance(expires_delta, datetime.timedelta):
-        expire = datetime.datetime.now() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.datetime.now() + datetime.timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES or 60)
+        expire = now + datetime.timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES or 60)
 
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def create_user_access_token(user: User) -> str:
+    """
+    Access-Token inkl. Rollen-Level und Token-Version, damit im AUTH_STATELESS-Modus
+    ohne Datenbankzugriff autorisiert werden kann.
+    """
+    role = UserRole.from_label(user.role)
+    return create_access_token({
+        "uid": user.uid,
+        "role": role.label,
+        "lvl": role.level,
+        "ver": user.tokenVersion
+    })
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -42,14 +68,17 @@ async def verify_public_key(request: Request):
             status="PUB_KEY_MISSING"
         )
 
-    db_key = await PublicKeys.find_one(PublicKeys.key == key, PublicKeys.isActive == True)
-    if not db_key:
+    await enforce_rate_limit("public-key", hash_public_key(key))
+
+    entry = await find_active_public_key(key)
+    if not entry:
         raise GeneralException(
             is_ok=False,
             status_code=status.HTTP_401_UNAUTHORIZED,
             exception="Der öffentliche Schlüssel wurde entweder nicht gefunden oder ist nicht aktiv.",
             status="PUB_KEY_MISSING"
         )
+    db_key, allowlist = entry
 
     if db_key.is_expired():
         raise GeneralException(
@@ -59,15 +88,12 @@ async def verify_public_key(request: Request):
             status="PUB_KEY_MISSING"
         )
 
-    if db_key.allowedIps:
-        client_ip = request.client.host
-        if client_ip not in db_key.allowedIps:
-            raise GeneralException(
-                is_ok=False,
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                exception="Die, im Header übermittelte, IP ist für diesen Schlüssel nicht gültig.",
-                status="PUB_KEY_MISSING"
-            )
-
-    db_key.last_used_at = datetime.datetime.now()
-    await db_key.save()
+    if allowlist is not None and get_client_ip(request) not in allowlist:
+        raise GeneralException(
+            is_ok=False,
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            exception="Die, im Header übermittelte, IP ist für diesen Schlüssel nicht gültig.",
+            status="PUB_KEY_MISSING"
+        )
+
+    record_key_usage(db_key.uid)
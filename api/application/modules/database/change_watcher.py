@@ -0,0 +1,55 @@
+import asyncio
+from typing import Awaitable, Callable, Type
+from beanie import Document
+from pymongo.errors import OperationFailure, PyMongoError
+from application.modules.utils.logger import get_logger
+from application.modules.utils.settings import get_settings
+
+_watch_tasks: dict[str, asyncio.Task] = {}
+
+
+async def _watch_collection(document_model: Type[Document], on_change: Callable[[], Awaitable[None]]):
+    """
+    Ruft on_change() bei jeder Änderung an der Collection auf. Ohne Replica Set (Standalone-mongod)
+    stehen keine Change Streams zur Verfügung – dann wird im Intervall CHANGE_STREAM_POLL_SECONDS gepollt.
+    """
+    logger = get_logger('database')
+    name = document_model.get_collection_name()
+    collection = document_model.get_motor_collection()
+
+    while True:
+        try:
+            async with collection.watch() as stream:
+                logger.info(f"🔁 Change Stream für {name} aktiv")
+                await on_change()
+                async for _change in stream:
+                    await on_change()
+        except OperationFailure as e:
+            logger.warning(f"⚠️ Change Streams nicht verfügbar ({e.code}) – nutze Polling für {name}")
+            while True:
+                await asyncio.sleep(get_settings().CHANGE_STREAM_POLL_SECONDS)
+                try:
+                    await on_change()
+                except PyMongoError as poll_error:
+                    # Das äußere except greift hier nicht – einzelne Fehler dürfen das Polling nicht beenden
+                    logger.error(f"❌ Polling für {name} fehlgeschlagen: {poll_error}")
+        except asyncio.CancelledError:
+            raise
+        except PyMongoError as e:
+            logger.error(f"❌ Change Stream für {name} unterbrochen: {e}")
+            await asyncio.sleep(get_settings().CHANGE_STREAM_POLL_SECONDS)
+
+
+def start_collection_watcher(document_model: Type[Document], on_change: Callable[[], Awaitable[None]]):
+    name = document_model.get_collection_name()
+    task = _watch_tasks.get(name)
+    if task is None or task.done():
+        _watch_tasks[name] = asyncio.create_task(_watch_collection(document_model, on_change))
+
+
+async def stop_collection_watchers():
+    tasks = list(_watch_tasks.values())
+    _watch_tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,8 +2,61 @@ from logging import Logger
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 from application.modules.database.database_models import User, Logins, Microsoft365, SMTPServer, WhiteLabelConfig, \
-    MatomoConfig, EmailVerification, PublicKeys
-from application.modules.utils.settings import Settings
+    MatomoConfig, EmailVerification, PublicKeys, RuntimeSetting, TokenRevocation, RateLimitCounter, RefreshToken, \
+    LoginStats, USER_TEXT_INDEX
+from application.modules.database.logins_timeseries import prepare_logins_collection, migrate_legacy_logins, \
+    apply_logins_retention
+from application.modules.utils.settings import Settings, get_settings
+
+# Gemeinsamer Client (ein Verbindungspool pro Prozess) für Beanie und die System-Routen
+_client: AsyncIOMotorClient | None = None
+_client_options: tuple | None = None
+
+
+def _client_kwargs(settings: Settings) -> dict:
+    # 0 bzw. leer = Standardwert des Treibers
+    options = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS or None,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS or None,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS or None,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS or None,
+    }
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return {key: value for key, value in options.items() if value is not None}
+
+
+def _open_client(settings: Settings) -> AsyncIOMotorClient:
+    """
+    Legt den gemeinsamen Client an bzw. ersetzt ihn, wenn sich URI oder Verbindungsoptionen geändert haben
+    (z.B. nach dem Setup). Nur von init_db aufgerufen, da Beanie danach neu initialisiert wird.
+    """
+    global _client, _client_options
+    kwargs = _client_kwargs(settings)
+    options = (settings.MONGODB_URI, tuple(sorted(kwargs.items())))
+
+    if _client is None or options != _client_options:
+        if _client is not None:
+            _client.close()
+        _client = AsyncIOMotorClient(settings.MONGODB_URI, **kwargs)
+        _client_options = options
+    return _client
+
+
+def get_mongo_client() -> AsyncIOMotorClient:
+    """
+    Liefert den gemeinsamen Motor-Client; vor init_db (z.B. während des Setups) wird er hier angelegt.
+    """
+    return _client if _client is not None else _open_client(get_settings())
+
+
+def close_mongo_client():
+    global _client, _client_options
+    if _client is not None:
+        _client.close()
+        _client, _client_options = None, None
 
 
 async def init_db(logger: Logger, settings: Settings):
@@ -15,17 +68,30 @@ async def init_db(logger: Logger, settings: Settings):
         raise ValueError("MongoDB URI fehlt in der .env")
 
     logger.info(f"🔌 Verbindung zu MongoDB wird aufgebaut → {mongo_uri} / DB: {db_name}")
-    client = AsyncIOMotorClient(mongo_uri)
+    client = _open_client(settings)
     db = client.get_database(db_name)
+
+    retention_seconds = settings.LOGIN_RETENTION_DAYS * 86400 or None
+    Logins.Settings.timeseries.expire_after_seconds = retention_seconds
+    await prepare_logins_collection(db, logger)
+
+    if settings.USER_TEXT_SEARCH and USER_TEXT_INDEX not in User.Settings.indexes:
+        User.Settings.indexes.append(USER_TEXT_INDEX)
+
     document_models = [
             User,
             Logins,
+            LoginStats,
             Microsoft365,
             SMTPServer,
             MatomoConfig,
             WhiteLabelConfig,
             EmailVerification,
-            PublicKeys
+            PublicKeys,
+            RuntimeSetting,
+            TokenRevocation,
+            RateLimitCounter,
+            RefreshToken
         ]
 
     await init_beanie(
@@ -33,5 +99,8 @@ async def init_db(logger: Logger, settings: Settings):
         document_models=document_models,
     )
 
+    await migrate_legacy_logins(db, logger)
+    await apply_logins_retention(db, logger, retention_seconds)
+
     logger.info("✅ Beanie Models registriert & Indexe sichergestellt.")
     logger.info(f"📦 {len(document_models)} Models geladen – DB ready")
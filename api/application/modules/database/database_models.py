@@ -3,7 +3,8 @@ import secrets
 from typing import Optional, Literal, List
 
 import uuid6
-from beanie import Document, Indexed, Link
+from beanie import Document, Indexed, Link, TimeSeriesConfig, Granularity
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
 from pydantic import Field, EmailStr
 from enum import Enum
 from pydantic import HttpUrl
@@ -36,6 +37,13 @@ class UserRole(Enum):
     def __str__(self) -> str:
         return self._label
 
+    @classmethod
+    def from_label(cls, label: str) -> "UserRole":
+        return _ROLES_BY_LABEL.get(label, cls.viewer)
+
+
+_ROLES_BY_LABEL = {role.label: role for role in UserRole}
+
 
 class User(Document):
     uid: Indexed(str, unique=True)
@@ -46,9 +54,19 @@ class User(Document):
     role: Literal["viewer", "writer", "editor", "admin"] = Field(default=UserRole.viewer.label)
     isActive: bool
     lastSeen: Optional[datetime] = None
+    tokenVersion: int = 0
+    revision: int = 0
+    # Normalisierte Suchbegriffe (E-Mail, Vorname, Nachname, vollständiger Name) für die Präfixsuche
+    searchKeys: List[str] = Field(default_factory=list)
 
     class Settings:
         name = "Users"
+        # Sortierung der Benutzerliste (aktive zuerst, dann uid) mit und ohne Rollenfilter
+        indexes = [
+            IndexModel([("isActive", DESCENDING), ("uid", ASCENDING)]),
+            IndexModel([("role", ASCENDING), ("isActive", DESCENDING), ("uid", ASCENDING)]),
+            IndexModel([("searchKeys", ASCENDING)])
+        ]
 
     class Config:
         json_schema_extra = {
@@ -63,6 +81,14 @@ class User(Document):
         }
 
 
+# Optionaler Volltextindex für die unscharfe Benutzersuche, wird nur mit USER_TEXT_SEARCH angelegt
+USER_TEXT_INDEX = IndexModel(
+    [("email", TEXT), ("firstName", TEXT), ("lastName", TEXT)],
+    name="user_text_search",
+    default_language="none"
+)
+
+
 class Logins(Document):
     userUid: str
     timestamp: datetime
@@ -72,6 +98,16 @@ class Logins(Document):
 
     class Settings:
         name = "Logins"
+        # expire_after_seconds wird in init_db aus LOGIN_RETENTION_DAYS gesetzt
+        timeseries = TimeSeriesConfig(
+            time_field="timestamp",
+            meta_field="userUid",
+            granularity=Granularity.minutes
+        )
+        indexes = [
+            IndexModel([("userUid", ASCENDING), ("timestamp", DESCENDING)]),
+            IndexModel([("timestamp", DESCENDING), ("status", ASCENDING)])
+        ]
 
     class Config:
         json_schema_extra = {
@@ -83,6 +119,22 @@ class Logins(Document):
         }
 
 
+class LoginStats(Document):
+    day: str
+    userUid: str
+    success: int = 0
+    failed: int = 0
+    lastSuccessAt: Optional[datetime] = None
+    lastFailedAt: Optional[datetime] = None
+
+    class Settings:
+        name = "LoginStats"
+        indexes = [
+            IndexModel([("day", ASCENDING), ("userUid", ASCENDING)], unique=True),
+            IndexModel([("userUid", ASCENDING), ("day", DESCENDING)])
+        ]
+
+
 class Microsoft365(Document):
     uid: Indexed(str, unique=True)
     senderEmail: str
@@ -91,6 +143,7 @@ class Microsoft365(Document):
     secretKey: str
     tenantId: str
     createdAt: datetime = Field(default_factory=datetime.now)
+    revision: int = 0
 
     class Settings:
         name = "Microsoft365"
@@ -104,6 +157,7 @@ class SMTPServer(Document):
     password: str
     senderName: str
     senderEmail: str
+    revision: int = 0
 
     class Settings:
         name = "SMTPServer"
@@ -125,6 +179,7 @@ class MatomoConfig(Document):
     matomoUrl: HttpUrl
     matomoSiteId: str | int
     matomoApiKey: str
+    revision: int = 0
 
     class Settings:
         name = "MatomoConfig"
@@ -148,6 +203,7 @@ class WhiteLabelConfig(Document):
     contactMail: Optional[EmailStr] = None
     contactPhone: Optional[str] = None
     contactFax: Optional[str] = None
+    revision: int = 0
 
     class Settings:
         name = "WhiteLabelConfig"
@@ -201,9 +257,66 @@ class EmailVerification(Document):
         return datetime.now() > self.expiresAt
 
 
+class RuntimeSetting(Document):
+    key: Indexed(str, unique=True)
+    value: str
+    updatedAt: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "RuntimeSettings"
+
+    class Config:
+        json_schema_extra = {
+            "key": "SELF_SIGNUP",
+            "value": "true",
+            "updatedAt": datetime.now(),
+        }
+
+
+class TokenRevocation(Document):
+    userUid: Indexed(str, unique=True)
+    minTokenVersion: int
+    expiresAt: datetime
+    updatedAt: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "TokenRevocations"
+        indexes = [
+            IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0)
+        ]
+
+
+class RefreshToken(Document):
+    tokenHash: Indexed(str, unique=True)
+    userUid: Indexed(str)
+    familyId: str
+    expiresAt: datetime
+    usedAt: Optional[datetime] = None
+    createdAt: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "RefreshTokens"
+        indexes = [
+            IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0)
+        ]
+
+
+class RateLimitCounter(Document):
+    id: str
+    hits: int = 0
+    expiresAt: datetime
+
+    class Settings:
+        name = "RateLimitCounters"
+        indexes = [
+            IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0)
+        ]
+
+
 class PublicKeys(Document):
     uid: str = Field(default_factory=lambda: str(uuid6.uuid7()))
-    key: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+    key: Optional[str] = None
+    keyHash: Optional[str] = None
     name: str
     description: Optional[str] = None
     isActive: bool = True
@@ -216,6 +329,13 @@ class PublicKeys(Document):
 
     class Settings:
         name = "PublicKeys"
+        indexes = [
+            IndexModel(
+                [("keyHash", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"keyHash": {"$type": "string"}}
+            )
+        ]
 
     def is_expired(self) -> bool:
         return self.expiredAt < datetime.now() if self.expiredAt else False
@@ -0,0 +1,96 @@
+import asyncio
+import datetime
+from time import perf_counter, monotonic
+from application.modules.database.connection import get_mongo_client
+from application.modules.utils.background import start_periodic_task
+from application.modules.utils.settings import get_settings
+
+# Letzter Health-Snapshot der Datenbank und Zeitpunkt der Messung (monotonic)
+_snapshot: dict | None = None
+_snapshot_at: float = 0.0
+_probe_task: asyncio.Task | None = None
+_stats = {"probes": 0, "failedProbes": 0, "coalesced": 0, "forcedRefreshes": 0, "throttledRefreshes": 0}
+
+
+async def _probe() -> dict:
+    global _snapshot, _snapshot_at
+    settings = get_settings()
+    client = get_mongo_client()
+    _stats["probes"] += 1
+
+    try:
+        start = perf_counter()
+        result = await client.admin.command("ping")
+        duration = (perf_counter() - start) * 1000
+        if result.get("ok") != 1:
+            raise Exception("Ping fehlgeschlagen")
+
+        server_status, db_stats = await asyncio.gather(
+            client.admin.command("serverStatus"),
+            client.get_database(settings.MONGODB_DB_NAME).command("dbstats")
+        )
+        snapshot = {
+            "online": True,
+            "error": None,
+            "data": {
+                "dbName": settings.MONGODB_DB_NAME,
+                "serverVersion": server_status["version"],
+                "uptimeSeconds": server_status["uptime"],
+                "connectionCount": server_status["connections"]["current"],
+                "latencyMs": round(duration, 2),
+                "indexes": db_stats["indexes"],
+                "storageSizeMB": round(db_stats["storageSize"] / 1024 / 1024, 2)
+            }
+        }
+    except Exception as e:
+        _stats["failedProbes"] += 1
+        snapshot = {"online": False, "error": str(e), "data": None}
+
+    snapshot["checkedAt"] = datetime.datetime.now()
+    _snapshot, _snapshot_at = snapshot, monotonic()
+    return snapshot
+
+
+async def refresh_health_snapshot() -> dict:
+    """
+    Misst ping, serverStatus und dbstats neu. Gleichzeitige Aufrufe teilen sich eine laufende Messung.
+    """
+    global _probe_task
+    if _probe_task is None or _probe_task.done():
+        _probe_task = asyncio.create_task(_probe())
+    else:
+        _stats["coalesced"] += 1
+    return await asyncio.shield(_probe_task)
+
+
+async def get_health_snapshot(force_refresh: bool = False) -> tuple[dict, float]:
+    """
+    Liefert den zwischengespeicherten Snapshot und sein Alter in Sekunden. Gemessen wird nur, wenn noch
+    kein Snapshot existiert, er älter als zwei Prober-Intervalle ist oder force_refresh gesetzt ist –
+    erzwungene Messungen höchstens alle HEALTH_FORCE_REFRESH_MIN_SECONDS.
+    """
+    settings = get_settings()
+    age = monotonic() - _snapshot_at
+
+    if force_refresh and _snapshot is not None:
+        if age < settings.HEALTH_FORCE_REFRESH_MIN_SECONDS:
+            _stats["throttledRefreshes"] += 1
+        else:
+            _stats["forcedRefreshes"] += 1
+            await refresh_health_snapshot()
+    elif _snapshot is None or age > 2 * settings.HEALTH_PROBE_INTERVAL_SECONDS:
+        await refresh_health_snapshot()
+
+    return _snapshot, round(monotonic() - _snapshot_at, 2)
+
+
+def start_health_prober():
+    start_periodic_task("health-prober", get_settings().HEALTH_PROBE_INTERVAL_SECONDS, refresh_health_snapshot,
+                        run_on_stop=False)
+
+
+def get_health_prober_stats() -> dict:
+    return {
+        **_stats,
+        "snapshotAgeSeconds": round(monotonic() - _snapshot_at, 2) if _snapshot else None,
+    }
@@ -0,0 +1,90 @@
+from logging import Logger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+from application.modules.database.database_models import Logins
+
+LEGACY_LOGINS_COLLECTION = "Logins_legacy"
+# Checkpoint der Migration (letzte _id des zuletzt begonnenen Batches)
+LOGINS_MIGRATION_COLLECTION = "Logins_migration"
+
+
+async def _collection_options(db: AsyncIOMotorDatabase, name: str) -> dict | None:
+    async for info in await db.list_collections(filter={"name": name}):
+        return info.get("options", {})
+    return None
+
+
+async def prepare_logins_collection(db: AsyncIOMotorDatabase, logger: Logger):
+    """
+    Benennt eine bestehende, normale Logins-Collection vor init_beanie um, damit Beanie die
+    Time-Series-Collection neu anlegen kann. Die Daten werden anschließend von migrate_legacy_logins() übernommen.
+    """
+    options = await _collection_options(db, Logins.Settings.name)
+    if options is None or "timeseries" in options:
+        return
+
+    if await _collection_options(db, LEGACY_LOGINS_COLLECTION) is not None:
+        logger.warning(f"⚠️ {LEGACY_LOGINS_COLLECTION} existiert bereits – Umbenennung übersprungen")
+        return
+
+    await db[Logins.Settings.name].rename(LEGACY_LOGINS_COLLECTION)
+    logger.info(f"🔁 Logins-Collection nach {LEGACY_LOGINS_COLLECTION} umbenannt (Migration auf Time-Series)")
+
+
+async def migrate_legacy_logins(db: AsyncIOMotorDatabase, logger: Logger, batch_size: int = 1000):
+    """
+    Verschiebt Login-Einträge batchweise (nach _id sortiert) aus der alten Collection in die Time-Series-Collection.
+    Vor dem Schreiben wird die letzte _id des Batches als Checkpoint vermerkt. Da Time-Series-Collections keine
+    eindeutige _id erzwingen, werden nach einem Abbruch bereits geschriebene Einträge dieses Batches übersprungen.
+    """
+    if await _collection_options(db, LEGACY_LOGINS_COLLECTION) is None:
+        return
+
+    legacy = db[LEGACY_LOGINS_COLLECTION]
+    progress = db[LOGINS_MIGRATION_COLLECTION]
+    target = Logins.get_motor_collection()
+    checkpoint = await progress.find_one({"_id": Logins.Settings.name}) or {}
+    resume_up_to = checkpoint.get("pendingUpTo")
+    migrated = 0
+
+    while True:
+        batch = await legacy.find().sort("_id", ASCENDING).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        ids = [document["_id"] for document in batch]
+        documents = batch
+        if resume_up_to is not None and ids[0] <= resume_up_to:
+            written = {document["_id"] async for document in target.find({"_id": {"$in": ids}}, {"_id": 1})}
+            documents = [document for document in batch if document["_id"] not in written]
+
+        await progress.update_one({"_id": Logins.Settings.name}, {"$set": {"pendingUpTo": ids[-1]}}, upsert=True)
+        try:
+            if documents:
+                await target.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            logger.error(
+                f"❌ Migration der Login-Einträge unterbrochen ({len(e.details.get('writeErrors', []))} Fehler) – "
+                f"wird beim nächsten Start fortgesetzt"
+            )
+            return
+
+        await legacy.delete_many({"_id": {"$lte": ids[-1]}})
+        migrated += len(documents)
+
+    await legacy.drop()
+    await progress.drop()
+    logger.info(f"✅ {migrated} Login-Einträge in die Time-Series-Collection migriert")
+
+
+async def apply_logins_retention(db: AsyncIOMotorDatabase, logger: Logger, expire_after_seconds: int | None):
+    """
+    Gleicht die Aufbewahrungsdauer einer bestehenden Time-Series-Collection mit den Settings ab.
+    """
+    options = await _collection_options(db, Logins.Settings.name) or {}
+    if "timeseries" not in options or options.get("expireAfterSeconds") == expire_after_seconds:
+        return
+
+    await db.command("collMod", Logins.Settings.name, expireAfterSeconds=expire_after_seconds or "off")
+    logger.info(f"🗓️ Aufbewahrung der Login-Einträge auf {expire_after_seconds or 'unbegrenzt'} Sekunden gesetzt")
@@ -0,0 +1,51 @@
+from beanie import Document
+from starlette import status
+from application.modules.schemas.response_schemas import GeneralException
+
+
+def _conflict() -> GeneralException:
+    return GeneralException(
+        is_ok=False,
+        status="CONFLICT",
+        exception="Der Datensatz wurde zwischenzeitlich geändert, bitte neu laden und erneut speichern.",
+        status_code=status.HTTP_409_CONFLICT
+    )
+
+
+def changed_fields(document: Document, fields: dict) -> dict:
+    """
+    Reduziert fields auf Felder des Models, deren Wert sich gegenüber dem geladenen Dokument ändert.
+    """
+    current = document.model_dump()
+    return {
+        field: value for field, value in fields.items()
+        if field in type(document).model_fields and field != "revision" and current.get(field) != value
+    }
+
+
+async def update_fields(document: Document, fields: dict, expected_revision: int | None = None) -> dict:
+    """
+    Schreibt nur die geänderten Felder per $set und erhöht die Revision (optimistische Sperre).
+    Ohne expected_revision wird gegen die Revision des geladenen Dokuments geprüft.
+    Wurde das Dokument zwischenzeitlich geändert, wird mit 409 abgelehnt. Gibt die geschriebenen Felder zurück.
+    """
+    changes = changed_fields(document, fields)
+    revision = document.revision if expected_revision is None else expected_revision
+
+    if not changes:
+        if revision != document.revision:
+            raise _conflict()
+        return {}
+
+    # Dokumente aus älteren Versionen haben noch kein revision-Feld
+    revision_filter = {"revision": revision} if revision else {"revision": {"$in": [0, None]}}
+    result = await type(document).find_one({"_id": document.id, **revision_filter}).update(
+        {"$set": changes, "$inc": {"revision": 1}}
+    )
+    if not result.matched_count:
+        raise _conflict()
+
+    for field, value in changes.items():
+        setattr(document, field, value)
+    document.revision = revision + 1
+    return changes
@@ -0,0 +1,53 @@
+from datetime import datetime
+from dotenv import dotenv_values
+from beanie.operators import Set
+from pymongo.errors import DuplicateKeyError
+from application.modules.database.change_watcher import start_collection_watcher
+from application.modules.database.database_models import RuntimeSetting
+from application.modules.utils.settings import RUNTIME_KEYS, ENV_FILE, set_runtime_overrides, get_runtime_overrides
+
+
+async def load_runtime_settings():
+    """
+    Lädt alle Laufzeit-Schalter aus MongoDB in den lokalen Settings-Cache.
+    Fehlende Schlüssel werden einmalig mit den Werten aus der lokalen .env angelegt.
+    """
+    documents = await RuntimeSetting.find_all().to_list()
+    values = {document.key: document.value for document in documents}
+
+    missing = [key for key in RUNTIME_KEYS if key not in values]
+    if missing:
+        env_values = dotenv_values(ENV_FILE)
+        for key in missing:
+            if env_values.get(key) is None:
+                continue
+            try:
+                await RuntimeSetting(key=key, value=str(env_values[key])).insert()
+                values[key] = str(env_values[key])
+            except DuplicateKeyError:
+                existing = await RuntimeSetting.find_one(RuntimeSetting.key == key)
+                values[key] = existing.value
+
+    set_runtime_overrides(values)
+
+
+async def set_runtime_settings(**values: str):
+    """
+    Speichert Laufzeit-Schalter in MongoDB und aktualisiert den lokalen Cache sofort.
+    Andere Nodes erhalten die Änderung über den Change Stream bzw. das Polling.
+    """
+    for key, value in values.items():
+        if key not in RUNTIME_KEYS:
+            raise ValueError(f"'{key}' ist kein Laufzeit-Schalter")
+
+        await RuntimeSetting.find_one(RuntimeSetting.key == key).upsert(
+            Set({RuntimeSetting.value: str(value), RuntimeSetting.updatedAt: datetime.now()}),
+            on_insert=RuntimeSetting(key=key, value=str(value))
+        )
+
+    set_runtime_overrides({**get_runtime_overrides(), **{key: str(value) for key, value in values.items()}})
+
+
+async def start_runtime_settings_watcher():
+    await load_runtime_settings()
+    start_collection_watcher(RuntimeSetting, load_runtime_settings)
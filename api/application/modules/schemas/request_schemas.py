@@ -47,6 +47,7 @@ class Branding(BaseModel):
     contactMail: Optional[EmailStr] = None
     contactPhone: Optional[str] = None
     contactFax: Optional[str] = None
+    revision: Optional[int] = None
 
 
 class SMTPSettings(BaseModel):
@@ -57,6 +58,7 @@ class SMTPSettings(BaseModel):
     senderName: Optional[str] = None
     senderEmail: Optional[EmailStr] = None
     tested: Optional[bool] = None
+    revision: Optional[int] = None
 
 
 class M365Settings(BaseModel):
@@ -66,6 +68,7 @@ class M365Settings(BaseModel):
     authenticated: Optional[bool] = None
     senderName: Optional[str] = None
     senderEmail: Optional[EmailStr] = None
+    revision: Optional[int] = None
 
 
 class MailServer(BaseModel):
@@ -79,6 +82,7 @@ class Analytics(BaseModel):
     matomoSiteId: Optional[str] = None
     matomoApiKey: Optional[str] = None
     connectionTested: Optional[bool] = None
+    revision: Optional[int] = None
 
 
 class License(BaseModel):
@@ -107,6 +111,10 @@ class VerifyRequest(BaseModel):
     code: str
 
 
+class RefreshRequest(BaseModel):
+    refreshToken: str
+
+
 class BackupSettingsRequest(BaseModel):
     frequency: BackupFrequency
     cleanUpDays: int = 30
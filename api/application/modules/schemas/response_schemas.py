@@ -1,20 +1,24 @@
+import datetime
 from typing import Annotated, List
 from fastapi import Path
 from pydantic import BaseModel
 from application.modules.schemas.request_schemas import Branding, MailServer, DatabaseConfig, Analytics
 from application.modules.schemas.schemas import GetUser, MatomoAnalytics, ServerStatusSchema, DatabaseHealthSchema, \
-    PublicKeySchema, BackupFile
+    PublicKeySchema, BackupFile, LoginHistoryEntry, FailedLoginGroup, LoginHistogramBucket, UserImportResult, \
+    UserSearchResult, ReadinessProbe
 from application.modules.setup.setup_env import BackupFrequency
 
 
 # region Response Schemas
 
 class GeneralException(Exception):
-    def __init__(self, exception: str, status: str, status_code: int = 400, is_ok: bool = False):
+    def __init__(self, exception: str, status: str, status_code: int = 400, is_ok: bool = False,
+                 headers: dict[str, str] | None = None):
         self.exception = exception
         self.status_code = status_code
         self.isOk = is_ok
         self.status = status
+        self.headers = headers
 
 
 class GeneralExceptionSchema(BaseModel):
@@ -87,17 +91,57 @@ class PaginationResponse(BaseResponse):
         title="Anzahl aller Seiten",
         description="Anzahl der Seiten.")
     ]
+    nextCursor: Annotated[str | None, Path(
+        title="Cursor der nächsten Seite",
+        description="Als `cursor` übergeben, um die nächste Seite abzurufen. `null`, wenn das Ende erreicht ist.")
+    ] = None
+
+
+class CursorPaginationResponse(BaseResponse):
+    nextCursor: Annotated[str | None, Path(
+        title="Cursor der nächsten Seite",
+        description="Als `cursor` übergeben, um die nächste Seite abzurufen. `null`, wenn das Ende erreicht ist.")
+    ] = None
 
 
 class AuthResponse(BaseResponse):
     data: GetUser
 
 
-class UsersResponse(BaseResponse):
+class UsersResponse(PaginationResponse):
     data: List[GetUser]
     todaysLogins: int
+    todaysFailedLogins: int = 0
     administrators: int
     activeUsers: int
+    onlineUsers: int = 0
+
+
+class LoginHistoryResponse(CursorPaginationResponse):
+    data: List[LoginHistoryEntry]
+
+
+class FailedLoginsResponse(BaseResponse):
+    data: List[FailedLoginGroup]
+
+
+class LoginHistogramResponse(BaseResponse):
+    data: List[LoginHistogramBucket]
+
+
+class UserImportResponse(BaseResponse):
+    created: int
+    updated: int
+    failed: int
+    data: List[UserImportResult]
+
+
+class UserSearchResponse(BaseResponse):
+    data: List[UserSearchResult]
+
+
+class MetricsResponse(BaseResponse):
+    data: dict
 
 
 class PingResponse(BaseResponse):
@@ -106,6 +150,8 @@ class PingResponse(BaseResponse):
 
 class DbHealthResponse(BaseResponse):
     data: DatabaseHealthSchema
+    checkedAt: datetime.datetime
+    ageSeconds: float
 
 
 class BackupResponse(BaseResponse):
@@ -129,6 +175,10 @@ class StatusResponse(BaseResponse):
     data: ServerStatusSchema
 
 
+class ReadinessResponse(BaseResponse):
+    data: List[ReadinessProbe]
+
+
 class MatomoAnalyticsResponse(BaseResponse):
     data: MatomoAnalytics
 
@@ -14,8 +14,10 @@ class GetUser(BaseModel):
     lastName: str
     role: str
     isActive: bool
-    lastSeen: datetime.datetime
-    accessToken: str | None
+    lastSeen: datetime.datetime | None = None
+    accessToken: str | None = None
+    refreshToken: str | None = None
+    revision: int = 0
 
     class Config:
         json_schema_extra = {
@@ -28,9 +30,16 @@ class GetUser(BaseModel):
             "isActive": True,
             "lastSeen": datetime.datetime.now(),
             "accessToken": "<BEARER TOKEN>",
+            "refreshToken": "<REFRESH TOKEN>",
         }
 
 
+class TokenPrincipal(BaseModel):
+    uid: str
+    role: str
+    level: int
+
+
 class CreateUserSelf(BaseModel):
     email: str
     password: str
@@ -68,6 +77,7 @@ class UpdateUser(BaseModel):
     lastName: Optional[str]
     role: Optional[Literal["admin", "editor", "writer", "viewer"]]
     isActive: Optional[bool]
+    revision: Optional[int] = None
 
     class Config:
         json_schema_extra = {
@@ -77,9 +87,37 @@ class UpdateUser(BaseModel):
             "lastName": "Doe",
             "role": "admin",
             "isActive": True,
+            "revision": 3,
         }
 
 
+class ImportUserRow(BaseModel):
+    email: str
+    password: Optional[str] = None
+    firstName: Optional[str] = None
+    lastName: Optional[str] = None
+    role: Optional[Literal["viewer", "writer", "editor", "admin"]] = None
+    isActive: Optional[bool] = None
+
+
+class UserImportResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: Literal["created", "updated", "failed"]
+    uid: Optional[str] = None
+    error: Optional[str] = None
+
+
+class UserSearchResult(BaseModel):
+    uid: str
+    email: str
+    firstName: str
+    lastName: str
+    role: str
+    isActive: bool
+    score: Optional[float] = None
+
+
 class MatomoSummaryItem(BaseModel):
     label: str
     icon: str | None = None
@@ -122,6 +160,27 @@ class MatomoAnalytics(BaseModel):
     url: HttpUrl
 
 
+class LoginHistoryEntry(BaseModel):
+    timestamp: datetime.datetime
+    ipAddress: str
+    userAgent: str
+    status: bool
+
+
+class FailedLoginGroup(BaseModel):
+    ipAddress: Optional[str] = None
+    userAgent: Optional[str] = None
+    attempts: int
+    users: int
+    lastAttempt: datetime.datetime
+
+
+class LoginHistogramBucket(BaseModel):
+    start: datetime.datetime
+    success: int
+    failed: int
+
+
 class ServerStatusSchema(BaseModel):
     databaseOnline: bool
     selfSignupEnabled: bool
@@ -130,6 +189,16 @@ class ServerStatusSchema(BaseModel):
     matomoConfigured: bool
 
 
+class ReadinessProbe(BaseModel):
+    name: str
+    status: Literal["ok", "failed", "skipped"]
+    critical: bool
+    detail: Optional[str] = None
+    durationMs: float
+    checkedAt: datetime.datetime
+    ageSeconds: float
+
+
 class DatabaseHealthSchema(BaseModel):
     dbName: str
     serverVersion: str
@@ -1,9 +1,19 @@
+import os
+import re
 import secrets
+import tempfile
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from dotenv import dotenv_values, set_key
+from dotenv import dotenv_values
 from cryptography.fernet import Fernet
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 
 class BackupFrequency(Enum):
     daily = "Täglich"
@@ -11,6 +21,71 @@ class BackupFrequency(Enum):
     monthly = "Monatlich"
 
 
+@contextmanager
+def env_file_lock(env_file: Path):
+    """
+    Exklusiver, prozessübergreifender Lock auf eine .lock-Datei neben der .env.
+    """
+    lock_path = env_file.with_name(f"{env_file.name}.lock")
+    with open(lock_path, "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Ohne Anführungszeichen liest python-dotenv den Wert unverändert, solange er keine Zeilenumbrüche,
+# Randleerzeichen, Kommentare (" #") oder Variablen ("${") enthält und nicht mit einem Anführungszeichen beginnt
+_UNQUOTED_SAFE = re.compile(r"""(?!['"])(?!.*\s#)(?!.*\$\{)\S(?:[^\r\n]*\S)?""")
+
+
+def _quote_env_value(value: str) -> str:
+    """
+    Maskiert einen Wert so, dass python-dotenv ihn unverändert zurückliest. In einfachen Anführungszeichen werden
+    \\ und \\' entschlüsselt, daher wird \\ vor ' maskiert. Ein Backslash direkt vor dem schließenden
+    Anführungszeichen ist dort nicht darstellbar – solche Werte werden, wenn möglich, ohne Anführungszeichen geschrieben.
+    """
+    if not value.endswith("\\"):
+        escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+    if _UNQUOTED_SAFE.fullmatch(value):
+        return value
+    raise ValueError("Wert mit abschließendem Backslash kann nicht in die .env geschrieben werden")
+
+
+def write_env_atomic(env_file: Path, values: dict):
+    """
+    Schreibt alle Werte in einem Durchgang in eine temporäre Datei und ersetzt die .env
+    anschließend per os.replace(). Leser sehen damit entweder die alte oder die neue Datei,
+    nie einen halb geschriebenen Zustand. Werte None (Zeilen ohne "=" in der .env) werden ausgelassen.
+    """
+    directory = env_file.resolve().parent
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{env_file.name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for key, value in values.items():
+                if value is None:
+                    continue
+                f.write(f"{key}={_quote_env_value(str(value))}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if env_file.exists():
+            os.chmod(tmp_path, env_file.stat().st_mode & 0o777)
+        os.replace(tmp_path, env_file)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
 def setup_env(
         secret_key: str = None,
         fernet_key: str = None,
@@ -24,6 +99,11 @@ def setup_env(
         backup_started: str = None,
         backup_cleanup: str = None
 ):
+    """
+    Schreibt die übergebenen Werte (sonst die bisherigen bzw. Standardwerte) atomar in die .env und lädt die
+    Settings dieses Prozesses neu. Andere Worker werden nicht benachrichtigt: sie prüfen bei jedem
+    get_settings() Inode, Änderungszeit und Größe der .env und lesen die Datei danach neu ein.
+    """
     env_file = Path(".env")
 
     default_env = {
@@ -44,26 +124,25 @@ def setup_env(
         "BACKUP_CLEANUP": "10"
     }
 
-    if not env_file.exists():
-        with open(env_file, "w") as f:
-            for key, val in default_env.items():
-                f.write(f"{key}={val}\n")
-
-    current_env = dotenv_values(env_file)
-
-    updates = {
-        "SECRET_KEY": secret_key or current_env.get("SECRET_KEY") or secrets.token_urlsafe(64),
-        "FERNET_KEY": fernet_key or current_env.get("FERNET_KEY") or Fernet.generate_key().decode(),
-        "MONGODB_URI": mongodb_uri or current_env.get("MONGODB_URI") or "",
-        "MONGODB_DB_NAME": mongodb_db_name or current_env.get("MONGODB_DB_NAME") or "",
-        "EMAIL_VERIFICATION": email_verification or current_env.get("EMAIL_VERIFICATION"),
-        "SELF_SIGNUP": self_signup or current_env.get("SELF_SIGNUP"),
-        "SETUP_COMPLETED": setup_completed or current_env.get("SETUP_COMPLETED"),
-        "EXTERNAL_URL": external_url or current_env.get("EXTERNAL_URL"),
-        "BACKUP_FREQUENCY": (backup_frequency.name if backup_frequency else None) or current_env.get("BACKUP_FREQUENCY"),
-        "BACKUP_STARTED": backup_started or current_env.get("BACKUP_STARTED"),
-        "BACKUP_CLEANUP": backup_cleanup or current_env.get("BACKUP_CLEANUP"),
-    }
+    with env_file_lock(env_file):
+        current_env = {**default_env, **dotenv_values(env_file)} if env_file.exists() else dict(default_env)
+
+        updates = {
+            "SECRET_KEY": secret_key or current_env.get("SECRET_KEY") or secrets.token_urlsafe(64),
+            "FERNET_KEY": fernet_key or current_env.get("FERNET_KEY") or Fernet.generate_key().decode(),
+            "MONGODB_URI": mongodb_uri or current_env.get("MONGODB_URI") or "",
+            "MONGODB_DB_NAME": mongodb_db_name or current_env.get("MONGODB_DB_NAME") or "",
+            "EMAIL_VERIFICATION": email_verification or current_env.get("EMAIL_VERIFICATION"),
+            "SELF_SIGNUP": self_signup or current_env.get("SELF_SIGNUP"),
+            "SETUP_COMPLETED": setup_completed or current_env.get("SETUP_COMPLETED"),
+            "EXTERNAL_URL": external_url or current_env.get("EXTERNAL_URL"),
+            "BACKUP_FREQUENCY": (backup_frequency.name if backup_frequency else None) or current_env.get("BACKUP_FREQUENCY"),
+            "BACKUP_STARTED": backup_started or current_env.get("BACKUP_STARTED"),
+            "BACKUP_CLEANUP": backup_cleanup or current_env.get("BACKUP_CLEANUP"),
+        }
+
+        write_env_atomic(env_file, {**current_env, **updates})
 
-    for key, value in updates.items():
-        set_key(str(env_file), key, str(value))
+    # Andere Worker erkennen die neue Datei über den geänderten Inode beim nächsten get_settings() (kein Signal)
+    from application.modules.utils.settings import reload_settings
+    reload_settings()
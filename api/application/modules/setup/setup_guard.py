@@ -22,6 +22,8 @@ class SetupGuardMiddleware(BaseHTTPMiddleware):
             ("GET", re.compile(r"^/redoc/?$")),
             ("GET", re.compile(r"^/openapi.json/?$")),
             ("GET", re.compile(rf"^{settings.API_PREFIX}/system/ping/?$")),
+            ("GET", re.compile(rf"^{settings.API_PREFIX}/system/live/?$")),
+            ("GET", re.compile(rf"^{settings.API_PREFIX}/system/ready/?$")),
             ("GET", re.compile(rf"^{settings.API_PREFIX}/setup/status/?$")),
             ("POST", re.compile(rf"^{settings.API_PREFIX}/setup/complete?$")),
             ("OPTIONS", re.compile(rf"^{settings.API_PREFIX}/setup/complete?$")),
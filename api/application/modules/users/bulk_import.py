@@ -0,0 +1,263 @@
+"""
+Massenimport bzw. -aktualisierung von Benutzern aus NDJSON oder CSV (eine Zeile pro Benutzer).
+
+    python -m application.modules.users.bulk_import benutzer.ndjson
+    python -m application.modules.users.bulk_import benutzer.csv --format csv --update-existing
+
+CSV-Dateien benötigen eine Kopfzeile mit den Spaltennamen (email, password, firstName, lastName, role, isActive).
+Ohne --update-existing werden nur neue Benutzer angelegt, bestehende E-Mail-Adressen werden als Fehler gemeldet.
+"""
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Literal
+from pydantic import ValidationError
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from uuid6 import uuid7
+from application.modules.auth.cache import invalidate_user
+from application.modules.auth.hashing import hash_password_async
+from application.modules.auth.revocation import revoke_user_tokens
+from application.modules.database.database_models import User
+from application.modules.schemas.response_schemas import GeneralException
+from application.modules.schemas.schemas import ImportUserRow, UserImportResult
+from application.modules.users.search import user_search_keys
+from application.modules.utils.settings import get_settings
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Versuche pro Zeile bei uid-Kollisionen bzw. ausgelastetem Hashing-Pool
+_MAX_ATTEMPTS = 3
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _iter_rows(lines: AsyncIterator[str], import_format: ImportFormat) -> AsyncIterator[tuple[int, dict | str]]:
+    """
+    Liefert (Zeilennummer, Daten) bzw. (Zeilennummer, Fehlermeldung) für nicht lesbare Zeilen.
+    """
+    header: list[str] | None = None
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        if import_format == "csv" and header is None:
+            header = [column.strip() for column in next(csv.reader([line]))]
+            continue
+
+        row += 1
+        try:
+            if import_format == "csv":
+                data = {key: value for key, value in zip(header, next(csv.reader([line]))) if value != ""}
+            else:
+                data = json.loads(line)
+                if not isinstance(data, dict):
+                    raise ValueError("JSON-Objekt erwartet")
+        except (ValueError, csv.Error) as e:
+            yield row, f"Zeile nicht lesbar: {e}"
+            continue
+        yield row, data
+
+
+async def _hash_password(password: str | None, semaphore: asyncio.Semaphore) -> str | None:
+    if not password:
+        return None
+
+    async with semaphore:
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            try:
+                return await hash_password_async(password)
+            except GeneralException as e:
+                if e.status_code != 503 or attempt == _MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(0.5 * attempt)
+
+
+def _new_user_document(entry: ImportUserRow, password_hash: str) -> dict:
+    return {
+        "uid": str(uuid7()),
+        "email": entry.email,
+        "password": password_hash,
+        "firstName": entry.firstName or "",
+        "lastName": entry.lastName or "",
+        "role": entry.role or "viewer",
+        "isActive": bool(entry.isActive),
+        "lastSeen": None,
+        "tokenVersion": 0,
+        "revision": 0,
+        "searchKeys": user_search_keys(entry.email, entry.firstName or "", entry.lastName or "")
+    }
+
+
+async def _import_chunk(chunk: list[tuple[int, ImportUserRow]], update_existing: bool,
+                        semaphore: asyncio.Semaphore) -> list[UserImportResult]:
+    collection = User.get_motor_collection()
+    results: dict[int, UserImportResult] = {}
+
+    existing: dict[str, dict] = {}
+    if update_existing:
+        emails = [entry.email for _row, entry in chunk]
+        existing = {
+            document["email"]: document async for document in collection.find(
+                {"email": {"$in": emails}}, {"email": 1, "uid": 1, "firstName": 1, "lastName": 1}
+            )
+        }
+
+    hashes = await asyncio.gather(
+        *(_hash_password(entry.password, semaphore) for _row, entry in chunk), return_exceptions=True
+    )
+
+    # (Zeile, Eintrag, Passwort-Hash, uid des bestehenden Benutzers)
+    pending: list[tuple[int, ImportUserRow, str | None, str | None]] = []
+    for (row, entry), password_hash in zip(chunk, hashes):
+        if isinstance(password_hash, Exception):
+            results[row] = UserImportResult(row=row, email=entry.email, status="failed",
+                                            error=f"Passwort konnte nicht gehasht werden: {password_hash}")
+        elif entry.email not in existing and not password_hash:
+            results[row] = UserImportResult(row=row, email=entry.email, status="failed",
+                                            error="Neue Benutzer benötigen ein Passwort")
+        else:
+            existing_uid = existing[entry.email]["uid"] if entry.email in existing else None
+            pending.append((row, entry, password_hash, existing_uid))
+
+    revoke_uids: set[str] = set()
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        if not pending:
+            break
+
+        operations, uids = [], []
+        for _row, entry, password_hash, existing_uid in pending:
+            if existing_uid:
+                fields = entry.model_dump(exclude_unset=True, exclude_none=True, exclude={"email", "password"})
+                if password_hash:
+                    fields["password"] = password_hash
+                if "firstName" in fields or "lastName" in fields:
+                    current = existing[entry.email]
+                    fields["searchKeys"] = user_search_keys(
+                        entry.email, fields.get("firstName", current.get("firstName", "")),
+                        fields.get("lastName", current.get("lastName", ""))
+                    )
+                # Revision erhöhen, damit offene Bearbeitungen mit altem Stand per 409 abgelehnt werden
+                operations.append(UpdateOne({"uid": existing_uid}, {"$set": fields, "$inc": {"revision": 1}}))
+                uids.append(existing_uid)
+            else:
+                document = _new_user_document(entry, password_hash)
+                operations.append(InsertOne(document))
+                uids.append(document["uid"])
+
+        errors: dict[int, dict] = {}
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = {error["index"]: error for error in e.details.get("writeErrors", [])}
+
+        retry = []
+        for index, (row, entry, password_hash, existing_uid) in enumerate(pending):
+            error = errors.get(index)
+            if error and error.get("code") == 11000 and "uid" in error.get("keyPattern", {}) \
+                    and attempt < _MAX_ATTEMPTS:
+                retry.append((row, entry, password_hash, existing_uid))
+            elif error:
+                duplicate_email = error.get("code") == 11000 and "email" in error.get("keyPattern", {})
+                message = "E-Mail existiert bereits" if duplicate_email else error.get("errmsg")
+                results[row] = UserImportResult(row=row, email=entry.email, status="failed", error=message)
+            elif existing_uid:
+                results[row] = UserImportResult(row=row, email=entry.email, status="updated", uid=existing_uid)
+                invalidate_user(existing_uid)
+                if entry.model_fields_set & {"password", "role", "isActive"}:
+                    revoke_uids.add(existing_uid)
+            else:
+                results[row] = UserImportResult(row=row, email=entry.email, status="created", uid=uids[index])
+        pending = retry
+
+    for uid in revoke_uids:
+        await revoke_user_tokens(uid)
+
+    return [results[row] for row, _entry in chunk]
+
+
+async def import_users(chunks: AsyncIterator[bytes], import_format: ImportFormat,
+                       update_existing: bool = False) -> list[UserImportResult]:
+    """
+    Liest Benutzer zeilenweise aus dem Datenstrom, hasht Passwörter parallel im Hashing-Pool und schreibt
+    blockweise (USER_IMPORT_CHUNK_SIZE) per ungeordnetem bulk_write. Gibt ein Ergebnis pro Zeile zurück.
+    """
+    settings = get_settings()
+    # Höchstens die Hälfte der Hashing-Worker, damit parallele Logins weiter bedient werden
+    semaphore = asyncio.Semaphore(max(1, settings.PASSWORD_HASH_WORKERS // 2))
+    results: list[UserImportResult] = []
+    chunk: list[tuple[int, ImportUserRow]] = []
+
+    async for row, data in _iter_rows(_iter_lines(chunks), import_format):
+        if isinstance(data, str):
+            results.append(UserImportResult(row=row, status="failed", error=data))
+            continue
+        try:
+            entry = ImportUserRow(**data)
+        except ValidationError as e:
+            error = e.errors()[0]
+            results.append(UserImportResult(
+                row=row, email=data.get("email") if isinstance(data.get("email"), str) else None, status="failed",
+                error=f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            ))
+            continue
+
+        entry.email = entry.email.strip()
+        chunk.append((row, entry))
+        if len(chunk) >= settings.USER_IMPORT_CHUNK_SIZE:
+            results.extend(await _import_chunk(chunk, update_existing, semaphore))
+            chunk = []
+
+    if chunk:
+        results.extend(await _import_chunk(chunk, update_existing, semaphore))
+    return sorted(results, key=lambda result: result.row)
+
+
+async def _read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while block := file.read(64 * 1024):
+            yield block
+
+
+async def _run_import(path: str, import_format: ImportFormat, update_existing: bool):
+    from application.modules.database.connection import init_db
+    from application.modules.utils.logger import get_logger
+
+    await init_db(get_logger('database'), get_settings())
+    results = await import_users(_read_file(path), import_format, update_existing)
+
+    for result in results:
+        if result.status == "failed":
+            print(f"Zeile {result.row}: {result.email or '-'} – {result.error}")
+    counts = {status: sum(1 for result in results if result.status == status) for status in ("created", "updated", "failed")}
+    print(f"\nAngelegt: {counts['created']}, aktualisiert: {counts['updated']}, fehlgeschlagen: {counts['failed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benutzer aus NDJSON oder CSV importieren")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None,
+                        help="Standard: anhand der Dateiendung")
+    parser.add_argument("--update-existing", action="store_true",
+                        help="Bestehende Benutzer (gleiche E-Mail) aktualisieren statt als Fehler melden")
+    args = parser.parse_args()
+
+    import_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    asyncio.run(_run_import(args.path, import_format, args.update_existing))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import re
+import unicodedata
+from pymongo import UpdateOne
+from application.modules.database.database_models import User
+from application.modules.utils.logger import get_logger
+
+# Felder der Suchtreffer, reicht für die Typeahead-Anzeige
+SEARCH_PROJECTION = {"_id": 0, "uid": 1, "email": 1, "firstName": 1, "lastName": 1, "role": 1, "isActive": 1}
+
+
+def normalize_search_term(value: str) -> str:
+    """
+    Kleinschreibung ohne diakritische Zeichen und mit einfachen Leerzeichen, z.B. " Jürgen  Müller" → "jurgen muller".
+    """
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return " ".join("".join(char for char in decomposed if not unicodedata.combining(char)).split())
+
+
+def user_search_keys(email: str, first_name: str, last_name: str) -> list[str]:
+    """
+    Suchbegriffe eines Benutzers; muss bei jeder Änderung von E-Mail oder Namen mitgeschrieben werden.
+    """
+    keys = [email, first_name, last_name, f"{first_name} {last_name}"]
+    return sorted({key for key in map(normalize_search_term, keys) if key})
+
+
+async def search_users(query: str, limit: int, fuzzy: bool = False) -> list[dict]:
+    """
+    Präfixsuche auf E-Mail, Vor-, Nach- und vollständigem Namen über den Multikey-Index auf searchKeys.
+    Mit fuzzy wird stattdessen der Volltextindex (ganze Wörter, nach Relevanz sortiert) abgefragt.
+    """
+    collection = User.get_motor_collection()
+    if fuzzy:
+        return await collection.find(
+            {"$text": {"$search": query}},
+            {**SEARCH_PROJECTION, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(limit).to_list(limit)
+
+    # Verankerter Regex ohne Optionen wird auf einen Indexbereich abgebildet
+    return await collection.find(
+        {"searchKeys": {"$regex": f"^{re.escape(normalize_search_term(query))}"}},
+        SEARCH_PROJECTION
+    ).limit(limit).to_list(limit)
+
+
+async def backfill_user_search_keys(batch_size: int = 500):
+    """
+    Ergänzt searchKeys für Benutzer aus älteren Versionen. Idempotent – bereits ergänzte Benutzer werden übersprungen.
+    """
+    collection = User.get_motor_collection()
+    migrated = 0
+
+    while True:
+        batch = await collection.find(
+            {"searchKeys": {"$exists": False}},
+            {"_id": 1, "email": 1, "firstName": 1, "lastName": 1}
+        ).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        await collection.bulk_write([
+            UpdateOne(
+                {"_id": document["_id"]},
+                {"$set": {"searchKeys": user_search_keys(
+                    document.get("email", ""), document.get("firstName", ""), document.get("lastName", "")
+                )}}
+            ) for document in batch
+        ], ordered=False)
+        migrated += len(batch)
+
+    if migrated:
+        get_logger('database').info(f"🔎 Suchbegriffe für {migrated} Benutzer ergänzt")
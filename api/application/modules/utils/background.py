@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable
+from application.modules.utils.logger import get_logger
+
+_periodic_tasks: dict[str, tuple[asyncio.Task, Callable[[], Awaitable[None]] | None]] = {}
+
+
+async def _run_periodically(name: str, interval_seconds: float, func: Callable[[], Awaitable[None]]):
+    logger = get_logger('system')
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Hintergrundaufgabe '{name}' fehlgeschlagen: {e}")
+
+
+def start_periodic_task(name: str, interval_seconds: float, func: Callable[[], Awaitable[None]],
+                        run_on_stop: bool = True):
+    """
+    Startet func() im Intervall als Hintergrundaufgabe. Beim Stoppen wird func() ein letztes Mal
+    ausgeführt, damit gepufferte Daten (z.B. Write-Behind-Updates) nicht verloren gehen (abschaltbar mit run_on_stop).
+    """
+    current = _periodic_tasks.get(name)
+    if current and not current[0].done():
+        return
+    task = asyncio.create_task(_run_periodically(name, interval_seconds, func))
+    _periodic_tasks[name] = (task, func if run_on_stop else None)
+
+
+async def stop_periodic_tasks():
+    logger = get_logger('system')
+    tasks = list(_periodic_tasks.items())
+    _periodic_tasks.clear()
+
+    for _name, (task, _func) in tasks:
+        task.cancel()
+    await asyncio.gather(*(task for _name, (task, _func) in tasks), return_exceptions=True)
+
+    for name, (_task, func) in tasks:
+        if func is None:
+            continue
+        try:
+            await func()
+        except Exception as e:
+            logger.error(f"❌ Abschluss der Hintergrundaufgabe '{name}' fehlgeschlagen: {e}")
@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Begrenzter LRU-Cache mit Ablaufzeit pro Eintrag und Hit/Miss-Zählern.
+    Nicht thread-safe – gedacht für die Nutzung innerhalb des Event-Loops.
+    Größe und Ablaufzeit können als Funktion übergeben werden, um geänderte Settings ohne Neustart zu übernehmen.
+    """
+
+    def __init__(self, max_size: int | Callable[[], int], ttl_seconds: float | Callable[[], float]):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size() if callable(self._max_size) else self._max_size
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds() if callable(self._ttl_seconds) else self._ttl_seconds
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None):
+        default_ttl = self.ttl_seconds
+        ttl = default_ttl if ttl_seconds is None else min(ttl_seconds, default_ttl)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        max_size = self.max_size
+        while len(self._entries) > max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "ttlSeconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,101 @@
+import csv
+import datetime
+import io
+import json
+from typing import AsyncIterator, Literal
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from starlette import status
+from starlette.responses import StreamingResponse
+from application.modules.schemas.response_schemas import GeneralException
+from application.modules.utils.settings import get_settings
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Exportierbare Felder je Collection; Passwörter, Schlüssel-Digests und interne Zähler bleiben außen vor
+USER_EXPORT_FIELDS = ["uid", "email", "firstName", "lastName", "role", "isActive", "lastSeen"]
+LOGIN_EXPORT_FIELDS = ["userUid", "timestamp", "ipAddress", "userAgent", "status"]
+PUBLIC_KEY_EXPORT_FIELDS = ["uid", "key", "name", "description", "isActive", "allowedIps", "expiredAt", "createdBy",
+                            "createdAt", "lastUsedAt", "metadata"]
+
+
+def select_fields(requested: str | None, allowed: list[str]) -> list[str]:
+    """
+    Wertet die kommagetrennte Feldauswahl aus, ohne Angabe werden alle erlaubten Felder exportiert.
+    """
+    if not requested:
+        return allowed
+
+    fields = list(dict.fromkeys(field.strip() for field in requested.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown or not fields:
+        raise GeneralException(
+            is_ok=False,
+            status="BAD_REQUEST",
+            exception=f"Unbekannte Felder: {', '.join(unknown) or '-'} (erlaubt: {', '.join(allowed)})",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    return fields
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} ist nicht serialisierbar")
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return "; ".join(map(str, value))
+    if isinstance(value, dict):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    return str(value)
+
+
+async def stream_export(collection: AsyncIOMotorCollection, query: dict, fields: list[str],
+                        sort: list[tuple[str, int]] | None, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Liest die Dokumente batchweise (EXPORT_BATCH_SIZE) vom Cursor und gibt je Batch einen Block NDJSON bzw. CSV aus.
+    Es liegt immer nur ein Batch im Speicher.
+    """
+    batch_size = get_settings().EXPORT_BATCH_SIZE
+    cursor = collection.find(query, {"_id": 0, **{field: 1 for field in fields}}, batch_size=batch_size)
+    if sort:
+        cursor = cursor.sort(sort)
+
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue().encode()
+
+    while documents := await cursor.to_list(batch_size):
+        if export_format == "csv":
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(document.get(field)) for field in fields] for document in documents)
+            yield buffer.getvalue().encode()
+        else:
+            yield "".join(
+                json.dumps({field: document.get(field) for field in fields}, default=_json_default,
+                           ensure_ascii=False) + "\n"
+                for document in documents
+            ).encode()
+
+
+def export_response(collection: AsyncIOMotorCollection, query: dict, fields: list[str],
+                    sort: list[tuple[str, int]] | None, export_format: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.date.today().isoformat()}.{export_format}"
+    return StreamingResponse(
+        stream_export(collection, query, fields, sort, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,20 +1,51 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from application.modules.auth.hashing import start_hash_pool, shutdown_hash_pool
+from application.modules.auth.login_logger import start_login_log_writer
+from application.modules.auth.presence import start_presence_tracker
+from application.modules.auth.public_keys import start_key_usage_flusher, migrate_plaintext_public_keys
+from application.modules.auth.rate_limit import start_rate_limit_cleanup
+from application.modules.auth.revocation import start_revocation_watcher
 from application.modules.backup.scheduler import start_backup_scheduler
+from application.modules.users.search import backfill_user_search_keys
+from application.modules.utils.background import stop_periodic_tasks
 from application.modules.utils.logger import get_logger
-from application.modules.utils.settings import get_settings
-from application.modules.database.connection import init_db
+from application.modules.utils.settings import get_settings, install_reload_signal
+from application.modules.database.connection import init_db, close_mongo_client
+from application.modules.database.health import start_health_prober
+from application.modules.database.change_watcher import stop_collection_watchers
+from application.modules.database.runtime_settings import start_runtime_settings_watcher
+
+
+async def start_background_services():
+    """
+    Startet Watcher, Migrationen und Write-Behind-Aufgaben. Setzt eine initialisierte Datenbank voraus und wird
+    sowohl beim Start (Setup bereits abgeschlossen) als auch nach einem Setup im laufenden Prozess aufgerufen.
+    Mehrfache Aufrufe sind unschädlich.
+    """
+    await start_runtime_settings_watcher()
+    await start_revocation_watcher()
+    await migrate_plaintext_public_keys()
+    await backfill_user_search_keys()
+    start_key_usage_flusher()
+    start_login_log_writer()
+    start_presence_tracker()
+    start_backup_scheduler()
+    start_health_prober()
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     logger = get_logger('database')
     settings = get_settings()
+    install_reload_signal()
+    start_rate_limit_cleanup()
+    await start_hash_pool()
 
     if settings.SETUP_COMPLETED:
         try:
             await init_db(logger, settings)
-            start_backup_scheduler()
+            await start_background_services()
             logger.info("✅ MongoDB initialisiert.")
         except Exception as e:
             logger.error(f"❌ Fehler beim Initialisieren der MongoDB: {e}")
@@ -22,3 +53,7 @@ async def lifespan(_app: FastAPI):
     else:
         logger.warning("⚠️ Setup nicht abgeschlossen – MongoDB-Init übersprungen.")
     yield
+    await stop_collection_watchers()
+    await stop_periodic_tasks()
+    close_mongo_client()
+    shutdown_hash_pool()
@@ -0,0 +1,42 @@
+import base64
+import binascii
+from typing import Any
+from bson import json_util
+from starlette import status
+from application.modules.schemas.response_schemas import GeneralException
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Kodiert die Sortierschlüssel des letzten Elements einer Seite (z.B. timestamp und _id) als opaken Cursor.
+    """
+    return base64.urlsafe_b64encode(json_util.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list:
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != length:
+        raise GeneralException(
+            is_ok=False,
+            status="BAD_REQUEST",
+            exception="Ungültiger Cursor",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+    return values
+
+
+def keyset_filter(fields: list[tuple[str, int]], values: list) -> dict:
+    """
+    Baut den Filter für die nächste Seite bei Sortierung nach fields, z.B. [("timestamp", -1), ("_id", -1)]:
+    (timestamp < t) oder (timestamp == t und _id < id).
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(fields):
+        clause = {previous: values[index] for index, (previous, _direction) in enumerate(fields[:position])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
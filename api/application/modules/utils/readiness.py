@@ -0,0 +1,137 @@
+import asyncio
+import datetime
+import json
+from pathlib import Path
+from time import perf_counter, monotonic
+from typing import Awaitable, Callable
+import httpx
+from jose import jwt
+from application.modules.database.connection import get_mongo_client
+from application.modules.database.database_models import SMTPServer, Microsoft365, MatomoConfig
+from application.modules.utils.settings import get_settings
+
+M365_TOKEN_PATH = Path("tokens", "mail_token.json")
+
+# Letztes Ergebnis je Probe (Zeitpunkt monotonic, Ergebnis) und laufende Probes
+_results: dict[str, tuple[float, dict]] = {}
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def _ok(detail: str | None = None) -> dict:
+    return {"status": "ok", "detail": detail}
+
+
+def _skipped(detail: str) -> dict:
+    return {"status": "skipped", "detail": detail}
+
+
+async def _probe_mongodb() -> dict:
+    if not get_settings().MONGODB_URI:
+        return _skipped("Setup nicht abgeschlossen")
+    result = await get_mongo_client().admin.command("ping")
+    if result.get("ok") != 1:
+        raise Exception("Ping fehlgeschlagen")
+    return _ok()
+
+
+async def _probe_smtp() -> dict:
+    if not get_settings().SETUP_COMPLETED:
+        return _skipped("Setup nicht abgeschlossen")
+    smtp = await SMTPServer.find_one()
+    if not smtp:
+        return _skipped("Nicht konfiguriert")
+
+    _reader, writer = await asyncio.open_connection(smtp.host, smtp.port)
+    writer.close()
+    await writer.wait_closed()
+    return _ok(f"{smtp.host}:{smtp.port} erreichbar")
+
+
+async def _probe_microsoft365() -> dict:
+    if not get_settings().SETUP_COMPLETED:
+        return _skipped("Setup nicht abgeschlossen")
+    if not await Microsoft365.find_one():
+        return _skipped("Nicht konfiguriert")
+
+    token_data = json.loads(await asyncio.to_thread(M365_TOKEN_PATH.read_text))
+    expires_at = datetime.datetime.fromtimestamp(jwt.get_unverified_claims(token_data["access_token"])["exp"])
+    if expires_at > datetime.datetime.now():
+        return _ok(f"Token gültig bis {expires_at.isoformat(timespec='seconds')}")
+    if token_data.get("refresh_token"):
+        return _ok("Token abgelaufen, wird beim nächsten Versand erneuert")
+    raise Exception("Token abgelaufen und kein Refresh-Token vorhanden")
+
+
+async def _probe_matomo() -> dict:
+    if not get_settings().SETUP_COMPLETED:
+        return _skipped("Setup nicht abgeschlossen")
+    matomo = await MatomoConfig.find_one()
+    if not matomo:
+        return _skipped("Nicht konfiguriert")
+
+    async with httpx.AsyncClient() as client:
+        response = await client.head(str(matomo.matomoUrl), follow_redirects=True)
+    if response.status_code >= 500:
+        raise Exception(f"HTTP {response.status_code}")
+    return _ok(f"HTTP {response.status_code}")
+
+
+# Name → (Probe, kritisch); nur kritische Probes entscheiden über die Bereitschaft
+PROBES: dict[str, tuple[Callable[[], Awaitable[dict]], bool]] = {
+    "mongodb": (_probe_mongodb, True),
+    "smtp": (_probe_smtp, False),
+    "microsoft365": (_probe_microsoft365, False),
+    "matomo": (_probe_matomo, False),
+}
+
+
+async def _run_probe(name: str) -> dict:
+    probe, critical = PROBES[name]
+    timeout = get_settings().READINESS_PROBE_TIMEOUT_SECONDS
+    start = perf_counter()
+    try:
+        result = await asyncio.wait_for(probe(), timeout)
+    except asyncio.TimeoutError:
+        result = {"status": "failed", "detail": f"Zeitüberschreitung nach {timeout} s"}
+    except Exception as e:
+        result = {"status": "failed", "detail": str(e) or type(e).__name__}
+
+    result.update(
+        name=name,
+        critical=critical,
+        durationMs=round((perf_counter() - start) * 1000, 2),
+        checkedAt=datetime.datetime.now()
+    )
+    _results[name] = (monotonic(), result)
+    return result
+
+
+def _start_probe(name: str) -> asyncio.Task:
+    task = _inflight.get(name)
+    if task is None or task.done():
+        task = _inflight[name] = asyncio.create_task(_run_probe(name))
+    return task
+
+
+async def _get_probe_result(name: str) -> dict:
+    """
+    Liefert das zwischengespeicherte Ergebnis sofort; ist es älter als READINESS_CACHE_SECONDS, wird im
+    Hintergrund neu geprüft. Nur ohne vorhandenes Ergebnis wird auf die (gemeinsame) Probe gewartet.
+    """
+    cached = _results.get(name)
+    if cached is None:
+        return await asyncio.shield(_start_probe(name))
+
+    checked_at, result = cached
+    if monotonic() - checked_at >= get_settings().READINESS_CACHE_SECONDS:
+        _start_probe(name)
+    return {**result, "ageSeconds": round(monotonic() - checked_at, 2)}
+
+
+async def check_readiness() -> tuple[bool, list[dict]]:
+    """
+    Prüft alle Abhängigkeiten parallel. Bereit ist der Dienst, wenn keine kritische Probe fehlgeschlagen ist.
+    """
+    results = await asyncio.gather(*(_get_probe_result(name) for name in PROBES))
+    ready = not any(result["critical"] and result["status"] == "failed" for result in results)
+    return ready, [{"ageSeconds": 0.0, **result} for result in results]
@@ -1,11 +1,15 @@
+import os
+import signal
+import threading
 from pathlib import Path
 
 from dotenv import dotenv_values
 from pydantic.v1 import BaseSettings
 
-if not Path(".env").exists():
-    from application.modules.setup.setup_env import setup_env
-    setup_env()
+ENV_FILE = Path(".env")
+
+# Veränderliche Laufzeit-Schalter, die bei Multi-Node-Betrieb aus MongoDB überschrieben werden
+RUNTIME_KEYS = ("SELF_SIGNUP", "EMAIL_VERIFICATION", "BACKUP_STARTED", "BACKUP_FREQUENCY", "BACKUP_CLEANUP")
 
 
 class Settings(BaseSettings):
@@ -24,11 +28,119 @@ class Settings(BaseSettings):
     BACKUP_FREQUENCY: str
     BACKUP_STARTED: bool
     BACKUP_CLEANUP: int
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: int = 0
+    MONGODB_COMPRESSORS: str = ""
+    MONGODB_CONNECT_TIMEOUT_MS: int = 10000
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_SOCKET_TIMEOUT_MS: int = 0
+    HEALTH_PROBE_INTERVAL_SECONDS: int = 15
+    HEALTH_FORCE_REFRESH_MIN_SECONDS: int = 5
+    READINESS_PROBE_TIMEOUT_SECONDS: float = 2
+    READINESS_CACHE_SECONDS: float = 5
+    CHANGE_STREAM_POLL_SECONDS: int = 10
+    AUTH_STATELESS: bool = False
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    PUBLIC_KEY_CACHE_TTL_SECONDS: int = 10
+    PUBLIC_KEY_CACHE_MAX_SIZE: int = 10000
+    PUBLIC_KEY_USAGE_FLUSH_SECONDS: int = 5
+    PRESENCE_FLUSH_SECONDS: int = 10
+    PRESENCE_WRITE_INTERVAL_SECONDS: int = 60
+    PRESENCE_ONLINE_SECONDS: int = 300
+    LOGIN_RETENTION_DAYS: int = 365
+    USER_IMPORT_CHUNK_SIZE: int = 500
+    USER_TEXT_SEARCH: bool = False
+    EXPORT_BATCH_SIZE: int = 1000
+    LOGIN_LOG_BATCH_SIZE: int = 200
+    LOGIN_LOG_FLUSH_SECONDS: float = 2
+    LOGIN_LOG_MAX_BUFFER: int = 10000
+    LOGIN_LOG_WRITE_CONCERN: str = "1"
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    # Kommagetrennte IPs/CIDR-Netze vorgeschalteter Proxies, nur deren X-Forwarded-For wird ausgewertet
+    TRUSTED_PROXIES: str = ""
+    RATE_LIMIT_LOGIN_PER_IP: int = 30
+    RATE_LIMIT_LOGIN_IP_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_LOGIN_FAILURES_PER_EMAIL: int = 10
+    RATE_LIMIT_LOGIN_EMAIL_WINDOW_SECONDS: int = 900
+    RATE_LIMIT_PUBLIC_KEY: int = 600
+    RATE_LIMIT_PUBLIC_KEY_WINDOW_SECONDS: int = 60
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
 
     class Config:
         env_file = ".env"
 
 
-def get_settings():
-    values = dotenv_values(Path(".env"))
-    return Settings(**values)
+_settings: Settings | None = None
+_fingerprint: tuple | None = None
+_runtime_overrides: dict = {}
+_lock = threading.RLock()
+
+
+def _env_fingerprint() -> tuple | None:
+    try:
+        stat = os.stat(ENV_FILE)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _load_settings() -> Settings:
+    values = dotenv_values(ENV_FILE)
+    return Settings(**{**values, **_runtime_overrides})
+
+
+def reload_settings() -> Settings:
+    """
+    Liest die .env neu ein und ersetzt den prozessweiten Settings-Snapshot.
+    Wird von setup_env nach jedem Schreibvorgang und bei SIGHUP aufgerufen.
+    """
+    global _settings, _fingerprint
+    with _lock:
+        _fingerprint = _env_fingerprint()
+        _settings = _load_settings()
+        return _settings
+
+
+def get_settings() -> Settings:
+    """
+    Gibt den gecachten Settings-Snapshot zurück. Die .env wird nur neu eingelesen,
+    wenn sich Inode, Änderungszeit oder Größe der Datei geändert haben.
+    """
+    settings = _settings
+    if settings is None or _env_fingerprint() != _fingerprint:
+        return reload_settings()
+    return settings
+
+
+def get_runtime_overrides() -> dict:
+    return dict(_runtime_overrides)
+
+
+def set_runtime_overrides(values: dict) -> Settings:
+    """
+    Ersetzt die Laufzeit-Overrides (siehe RUNTIME_KEYS) und baut den Snapshot neu auf.
+    """
+    global _runtime_overrides
+    with _lock:
+        _runtime_overrides = {key: value for key, value in values.items() if key in RUNTIME_KEYS}
+        return reload_settings()
+
+
+def install_reload_signal():
+    """
+    Registriert SIGHUP als Trigger für reload_settings() (nur auf POSIX-Systemen verfügbar).
+    """
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(signal.SIGHUP, lambda _signum, _frame: reload_settings())
+
+
+if not ENV_FILE.exists():
+    from application.modules.setup.setup_env import setup_env
+    setup_env()
@@ -1,17 +1,39 @@
-from fastapi import APIRouter, Depends
+import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, Path, Query
+from starlette import status
+from application.modules.analytics.login_analytics import get_login_history, get_failed_login_groups, \
+    get_login_histogram
 from application.modules.analytics.matomo_client import MatomoAPIClient
 from application.modules.analytics.matomo_extractor import (extract_top_pages, extract_top_referrers,
                                                             extract_top_countries, extract_summary,
                                                             get_two_week_windows)
-from application.modules.auth.dependencies import get_current_user
-from application.modules.database.database_models import MatomoConfig
+from application.modules.auth.dependencies import get_current_user, require_role
+from application.modules.database.database_models import MatomoConfig, UserRole, Logins
 from application.modules.schemas.response_schemas import (ValidationError, GeneralExceptionSchema,
-                                                          GeneralException, MatomoAnalyticsResponse)
-from application.modules.schemas.schemas import MatomoAnalytics
+                                                          GeneralException, MatomoAnalyticsResponse,
+                                                          LoginHistoryResponse, FailedLoginsResponse,
+                                                          LoginHistogramResponse)
+from application.modules.utils.export import ExportFormat, LOGIN_EXPORT_FIELDS, select_fields, export_response
+from application.modules.schemas.schemas import MatomoAnalytics, LoginHistoryEntry, FailedLoginGroup, \
+    LoginHistogramBucket
+
+# Obergrenze der Histogramm-Buckets pro Anfrage (z.B. 31 Tage stündlich)
+MAX_HISTOGRAM_BUCKETS = 744
 
 router = APIRouter()
 
 
+def _local_naive(value: datetime.datetime | None) -> datetime.datetime | None:
+    """
+    Login-Zeitstempel werden naiv in lokaler Zeit gespeichert; Zeitangaben mit Zeitzone (z.B. "...Z") werden
+    entsprechend umgerechnet, damit Vergleiche und Filter konsistent bleiben.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
 @router.get("/matomo",
             status_code=200,
             tags=["📊 Analytics"],
@@ -80,3 +102,217 @@ async def get_matomo_analytics(
             url=matomo_client.base_url
         )
     )
+
+
+@router.get("/logins/users/{uid}",
+            status_code=200,
+            tags=["📊 Analytics"],
+            name="Login-Verlauf eines Benutzers",
+            description="""
+                Gibt den Login-Verlauf eines Benutzers zurück, neueste Einträge zuerst.
+
+                💡 Hinweise:
+                - Keyset-Pagination: `nextCursor` der Antwort als `cursor` übergeben, um die nächste Seite abzurufen
+                - Optional nur erfolgreiche oder fehlgeschlagene Versuche (`status`)
+
+                🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Login-Einträge des Benutzers",
+            responses={
+                200: {
+                    'description': 'Login-Verlauf erfolgreich geladen',
+                    'model': LoginHistoryResponse
+                },
+                400: {
+                    'description': 'Ungültiger Cursor',
+                    'model': GeneralExceptionSchema
+                },
+                401: {
+                    'description': 'Nicht autorisiert – fehlender oder ungültiger Token',
+                    'model': GeneralExceptionSchema
+                },
+                422: {
+                    'description': 'Fehlerhafte Anfrageparameter',
+                    'model': ValidationError
+                }
+            })
+async def get_user_login_history(
+        uid: str = Path(..., description="UID des Benutzers"),
+        limit: int = Query(50, ge=1, le=500, description="Anzahl der Einträge pro Seite"),
+        cursor: str | None = Query(None, description="Cursor der nächsten Seite"),
+        login_status: bool | None = Query(None, alias="status", description="Nur erfolgreiche bzw. fehlgeschlagene Versuche"),
+        _user=Depends(require_role(UserRole.admin))
+):
+    entries, next_cursor = await get_login_history(uid, limit, cursor, login_status)
+
+    return LoginHistoryResponse(
+        isOk=True,
+        status="OK",
+        message="Login-Verlauf geladen",
+        data=[LoginHistoryEntry(**entry) for entry in entries],
+        nextCursor=next_cursor
+    )
+
+
+@router.get("/logins/failed",
+            status_code=200,
+            tags=["📊 Analytics"],
+            name="Fehlgeschlagene Logins nach Herkunft",
+            description="""
+                Gruppiert fehlgeschlagene Login-Versuche nach IP-Adresse und/oder User-Agent, häufigste zuerst.
+
+                ✅ Nützlich für:
+                - Erkennen von Brute-Force- und Credential-Stuffing-Versuchen
+                - Pflege von IP-Sperren und Rate-Limits
+
+                🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Gruppierte fehlgeschlagene Login-Versuche",
+            responses={
+                200: {
+                    'description': 'Auswertung erfolgreich geladen',
+                    'model': FailedLoginsResponse
+                },
+                401: {
+                    'description': 'Nicht autorisiert – fehlender oder ungültiger Token',
+                    'model': GeneralExceptionSchema
+                },
+                422: {
+                    'description': 'Fehlerhafte Anfrageparameter',
+                    'model': ValidationError
+                }
+            })
+async def get_failed_logins(
+        hours: int = Query(24, ge=1, le=24 * 90, description="Zeitraum in Stunden"),
+        group_by: Literal["ip", "userAgent", "both"] = Query("ip", alias="groupBy", description="Gruppierung"),
+        limit: int = Query(50, ge=1, le=500, description="Maximale Anzahl an Gruppen"),
+        _user=Depends(require_role(UserRole.admin))
+):
+    since = datetime.datetime.now() - datetime.timedelta(hours=hours)
+
+    return FailedLoginsResponse(
+        isOk=True,
+        status="OK",
+        message="Fehlgeschlagene Logins ausgewertet",
+        data=[FailedLoginGroup(**group) for group in await get_failed_login_groups(since, group_by, limit)]
+    )
+
+
+@router.get("/logins/export",
+            status_code=200,
+            tags=["📊 Analytics"],
+            name="Login-Einträge exportieren",
+            description="""
+                Exportiert Login-Einträge als NDJSON oder CSV, neueste zuerst. Die Antwort wird direkt vom
+                Datenbank-Cursor gestreamt, der Speicherbedarf bleibt konstant.
+
+                💡 Hinweise:
+                - Feldauswahl über `fields` (kommagetrennt), z.B. `timestamp,ipAddress,status`
+                - Filter nach Benutzer (`userUid`), Ergebnis (`status`) und Zeitraum (`since`, `until`)
+
+                🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Login-Einträge als NDJSON- bzw. CSV-Datei",
+            responses={
+                200: {
+                    'content': {'application/x-ndjson': {}, 'text/csv': {}},
+                    'description': 'Export wird gestreamt'
+                },
+                400: {
+                    'description': 'Unbekannte Felder in `fields`',
+                    'model': GeneralExceptionSchema
+                },
+                401: {
+                    'description': 'Nicht autorisiert – fehlender oder ungültiger Token',
+                    'model': GeneralExceptionSchema
+                },
+                422: {
+                    'description': 'Fehlerhafte Anfrageparameter',
+                    'model': ValidationError
+                }
+            })
+async def get_logins_export(
+        export_format: ExportFormat = Query("ndjson", alias="format", description="Ausgabeformat"),
+        fields: str | None = Query(None, description="Kommagetrennte Feldauswahl"),
+        user_uid: str | None = Query(None, alias="userUid", description="Nur Einträge dieses Benutzers"),
+        login_status: bool | None = Query(None, alias="status", description="Nur erfolgreiche bzw. fehlgeschlagene Versuche"),
+        since: datetime.datetime | None = Query(None, description="Beginn des Zeitraums"),
+        until: datetime.datetime | None = Query(None, description="Ende des Zeitraums (exklusiv)"),
+        _user=Depends(require_role(UserRole.admin))
+):
+    query: dict = {}
+    if user_uid:
+        query["userUid"] = user_uid
+    if login_status is not None:
+        query["status"] = login_status
+    since, until = _local_naive(since), _local_naive(until)
+    if since or until:
+        query["timestamp"] = {
+            **({"$gte": since} if since else {}),
+            **({"$lt": until} if until else {})
+        }
+
+    return export_response(
+        Logins.get_motor_collection(), query, select_fields(fields, LOGIN_EXPORT_FIELDS), [("timestamp", -1)],
+        export_format, "logins"
+    )
+
+
+@router.get("/logins/histogram",
+            status_code=200,
+            tags=["📊 Analytics"],
+            name="Login-Histogramm",
+            description="""
+                Anzahl erfolgreicher und fehlgeschlagener Logins pro Stunde oder Tag.
+
+                💡 Hinweise:
+                - Standardzeitraum: die letzten 7 Tage bis jetzt
+                - Pro Anfrage sind höchstens 744 Buckets möglich (z.B. 31 Tage stündlich)
+                - Optional auf einen Benutzer (`userUid`) eingeschränkt
+
+                🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Login-Zahlen pro Zeitintervall",
+            responses={
+                200: {
+                    'description': 'Histogramm erfolgreich geladen',
+                    'model': LoginHistogramResponse
+                },
+                400: {
+                    'description': 'Ungültiger oder zu großer Zeitraum',
+                    'model': GeneralExceptionSchema
+                },
+                401: {
+                    'description': 'Nicht autorisiert – fehlender oder ungültiger Token',
+                    'model': GeneralExceptionSchema
+                },
+                422: {
+                    'description': 'Fehlerhafte Anfrageparameter',
+                    'model': ValidationError
+                }
+            })
+async def get_logins_histogram(
+        interval: Literal["hour", "day"] = Query("day", description="Bucket-Größe"),
+        since: datetime.datetime | None = Query(None, description="Beginn des Zeitraums"),
+        until: datetime.datetime | None = Query(None, description="Ende des Zeitraums (exklusiv)"),
+        user_uid: str | None = Query(None, alias="userUid", description="Nur Logins dieses Benutzers"),
+        _user=Depends(require_role(UserRole.admin))
+):
+    until = _local_naive(until) or datetime.datetime.now()
+    since = _local_naive(since) or until - datetime.timedelta(days=7)
+    bucket = datetime.timedelta(hours=1) if interval == "hour" else datetime.timedelta(days=1)
+
+    if since >= until or (until - since) / bucket > MAX_HISTOGRAM_BUCKETS:
+        raise GeneralException(
+            is_ok=False,
+            status="BAD_REQUEST",
+            exception=f"Ungültiger Zeitraum – höchstens {MAX_HISTOGRAM_BUCKETS} Intervalle pro Anfrage",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+    return LoginHistogramResponse(
+        isOk=True,
+        status="OK",
+        message="Login-Histogramm geladen",
+        data=[LoginHistogramBucket(**entry) for entry in await get_login_histogram(interval, since, until, user_uid)]
+    )
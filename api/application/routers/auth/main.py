@@ -6,17 +6,22 @@ from uuid6 import uuid7
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from starlette import status
+from application.modules.auth.cache import invalidate_user, user_cache
 from application.modules.auth.dependencies import get_current_user
 from application.modules.auth.login_logger import log_login_attempt
-from application.modules.auth.security import create_access_token, hash_password
-from application.modules.auth.service import verify_password
+from application.modules.auth.refresh_tokens import issue_refresh_token, consume_refresh_token, \
+    revoke_refresh_token_family
+from application.modules.auth.rate_limit import enforce_rate_limit, record_rate_limit, get_client_ip
+from application.modules.auth.hashing import hash_password_async, verify_login_password
+from application.modules.auth.security import create_user_access_token
 from application.modules.database.database_models import User, LoginStatus, EmailVerification, Microsoft365, SMTPServer, \
     WhiteLabelConfig
 from application.modules.mail.mailer import send_html_email
-from application.modules.schemas.request_schemas import VerifyRequest
+from application.modules.schemas.request_schemas import VerifyRequest, RefreshRequest
 from application.modules.schemas.response_schemas import AuthResponse, ValidationError, GeneralException, BaseResponse, \
     GeneralExceptionSchema
 from application.modules.schemas.schemas import GetUser, CreateUserSelf
+from application.modules.users.search import user_search_keys
 from application.modules.utils.settings import get_settings
 
 router = APIRouter()
@@ -68,6 +73,19 @@ async def get_me(
     )
 
 
+async def _store_rehash(user: User, new_hash: str):
+    """
+    Ersetzt einen Hash mit veralteten Kosten, aber nur, wenn das Passwort seit dem Lesen unverändert ist.
+    Eine gleichzeitige Passwortänderung gewinnt; neu gehasht wird dann beim nächsten Login.
+    """
+    result = await User.find_one(User.uid == user.uid, User.password == user.password).update(
+        {"$set": {"password": new_hash}, "$inc": {"revision": 1}}
+    )
+    if result.modified_count:
+        user.password, user.revision = new_hash, user.revision + 1
+    invalidate_user(user.uid)
+
+
 @router.post("/login",
              status_code=200,
              tags=["🔐 Authentifizierung"],
@@ -80,8 +98,9 @@ async def get_me(
 
              💡 Hinweise:
              - Der Login erfolgt mit E-Mail und Passwort
-             - Bei Erfolg wird ein `access_token` im JSON-Format zurückgegeben
-             - Das Token ist standardmäßig 60 Minuten gültig
+             - Bei Erfolg werden `accessToken` und `refreshToken` im JSON-Format zurückgegeben
+             - Das Access-Token ist standardmäßig 60 Minuten gültig, danach über `/auth/refresh` erneuern
+             - Zu viele Versuche pro IP bzw. Fehlversuche pro E-Mail werden mit `429` und `Retry-After` abgelehnt
 
              🔐 Dieses Token wird für geschützte Routen benötigt (z.B. `/auth/me`, `/users`, etc.)
              """,
@@ -95,6 +114,10 @@ async def get_me(
                      'model': ValidationError,
                      'description': 'Validierungsfehler in der Anfrage'
                  },
+                 429: {
+                     'model': GeneralExceptionSchema,
+                     'description': 'Zu viele Login-Versuche'
+                 },
                  500: {
                      'model': GeneralExceptionSchema,
                      'description': 'Interner Serverfehler während der Verarbeitung der Daten'
@@ -104,9 +127,16 @@ async def post_login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
+    email_key = form_data.username.strip().lower()
+    await enforce_rate_limit("login-ip", get_client_ip(request))
+    await enforce_rate_limit("login-email", email_key, record=False)
+
     user = await User.find_one(User.email == form_data.username)
-    if not user or (user and not verify_password(form_data.password, user.password)):
-        if user and not verify_password(form_data.password, user.password):
+    password_valid, new_hash = await verify_login_password(form_data.password, user.password if user else None)
+
+    if not user or not password_valid:
+        await record_rate_limit("login-email", email_key)
+        if user:
             await log_login_attempt(request, user.uid, LoginStatus.failed)
         raise GeneralException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -114,22 +144,88 @@ async def post_login(
             exception="Benutzer nicht gefunden oder das Passwort ist falsch",
             is_ok=False
         )
-    if user and not user.isActive:
-        if user and not verify_password(form_data.password, user.password):
-            await log_login_attempt(request, user.uid, LoginStatus.failed)
+    if not user.isActive:
         raise GeneralException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             status="UNAUTHORIZED",
             exception="Benutzer ist nicht aktiv, bitte prüfen Sie ihr E-Mail Postfach",
             is_ok=False
         )
+    if new_hash:
+        await _store_rehash(user, new_hash)
+
     await log_login_attempt(request, user.uid, LoginStatus.success)
     return AuthResponse(
         isOk=True,
         status="OK",
         message="Benutzer gefunden",
         data=GetUser(
-            accessToken=create_access_token({"uid": user.uid}),
+            accessToken=create_user_access_token(user),
+            refreshToken=await issue_refresh_token(user.uid),
+            **user.__dict__,
+        )
+    )
+
+
+@router.post("/refresh",
+             status_code=200,
+             tags=["🔐 Authentifizierung"],
+             name="Access-Token erneuern",
+             description="""
+             Stellt anhand eines gültigen Refresh-Tokens ein neues Access-Token aus – ohne erneute Passwortprüfung.
+
+             💡 Hinweise:
+             - Jedes Refresh-Token ist nur einmal verwendbar und wird bei Erfolg durch ein neues ersetzt (Rotation)
+             - Wird ein bereits verwendetes Refresh-Token erneut vorgelegt, werden alle daraus entstandenen Tokens widerrufen
+             - Refresh-Tokens sind standardmäßig 30 Tage gültig
+             """,
+             response_description="Neues Access- und Refresh-Token im JSON-Format",
+             responses={
+                 200: {
+                     'model': AuthResponse,
+                     'description': 'Token erneuert'
+                 },
+                 401: {
+                     'model': GeneralExceptionSchema,
+                     'description': 'Refresh-Token ungültig, abgelaufen oder Benutzer nicht aktiv'
+                 },
+                 422: {
+                     'model': ValidationError,
+                     'description': 'Validierungsfehler in der Anfrage'
+                 },
+                 500: {
+                     'model': GeneralExceptionSchema,
+                     'description': 'Interner Serverfehler während der Verarbeitung der Daten'
+                 }
+             })
+async def post_refresh(
+    data: RefreshRequest
+):
+    uid, family_id = await consume_refresh_token(data.refreshToken)
+
+    user = user_cache.get(uid)
+    if user is None:
+        user = await User.find_one(User.uid == uid)
+        if user:
+            user_cache.set(uid, user)
+
+    if not user or not user.isActive:
+        await revoke_refresh_token_family(family_id)
+        raise GeneralException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            status="UNAUTHORIZED",
+            exception="Benutzer nicht gefunden oder nicht mehr aktiv",
+            is_ok=False
+        )
+
+    refresh_token = await issue_refresh_token(uid, family_id)
+    return AuthResponse(
+        isOk=True,
+        status="OK",
+        message="Token erneuert",
+        data=GetUser(
+            accessToken=create_user_access_token(user),
+            refreshToken=refresh_token,
             **user.__dict__,
         )
     )
@@ -201,12 +297,13 @@ async def post_signup(
     new_user = User(
         uid=uid,
         email=new_user.email,
-        password=hash_password(new_user.password),
+        password=await hash_password_async(new_user.password),
         firstName=new_user.firstName,
         lastName=new_user.lastName,
         isActive=False,
         role='viewer',
-        lastSeen=datetime.datetime.now()
+        lastSeen=datetime.datetime.now(),
+        searchKeys=user_search_keys(new_user.email, new_user.firstName, new_user.lastName)
     )
     await new_user.create()
 
@@ -306,6 +403,7 @@ async def post_verify(
 
     user.isActive = True
     await user.save()
+    invalidate_user(user.uid)
 
     token.isVerified = True
     await token.save()
@@ -11,8 +11,9 @@ from application.modules.schemas.response_schemas import (ValidationError, Gener
                                                           GeneralExceptionSchema, MicrosoftResponse, WhiteLabelResponse,
                                                           MailServerResponse, DatabaseResponse, AnalyticsResponse)
 from application.modules.database.database_models import WhiteLabelConfig, SMTPServer, Microsoft365, MatomoConfig
+from application.modules.database.partial_update import update_fields
 from application.modules.setup.setup_env import setup_env
-from application.modules.utils.crypto import encrypt_password
+from application.modules.utils.crypto import encrypt_password, decrypt_password
 from application.modules.utils.settings import get_settings
 
 router = APIRouter()
@@ -175,6 +176,10 @@ async def get_white_label():
             "model": GeneralExceptionSchema,
             "description": "Ungültige Konfigurationsdaten übermittelt"
         },
+        409: {
+            "model": GeneralExceptionSchema,
+            "description": "Konfiguration wurde zwischenzeitlich geändert"
+        },
         422: {
             "model": ValidationError,
             "description": "Validierungsfehler in der übermittelten Konfiguration"
@@ -204,10 +209,7 @@ async def put_white_label(
 
     del data.externalUrl
 
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(white_label_config, field, value)
-
-    await white_label_config.save()
+    await update_fields(white_label_config, data.model_dump(exclude_unset=True), data.revision)
 
     return BaseResponse(
         isOk=True,
@@ -331,6 +333,10 @@ async def get_mail(
             "description": "Ungültige Konfigurationsdaten – Validierung fehlgeschlagen",
             "model": GeneralExceptionSchema
         },
+        409: {
+            "description": "Konfiguration wurde zwischenzeitlich geändert",
+            "model": GeneralExceptionSchema
+        },
         401: {
             "description": "Nicht autorisiert – Token fehlt oder ist ungültig",
             "model": GeneralExceptionSchema
@@ -362,12 +368,14 @@ async def post_mail(
         if incoming_type != current_type:
             await mail_settings.delete()
         else:
-            for field, value in incoming_data.model_dump(exclude_unset=True).items():
-                if field in ('password', 'secretKey'):
-                    value = encrypt_password(value)
-                setattr(mail_settings, field, value)
+            fields = incoming_data.model_dump(exclude_unset=True)
+            for field in ('password', 'secretKey'):
+                if fields.get(field) and fields[field] != decrypt_password(getattr(mail_settings, field)):
+                    fields[field] = encrypt_password(fields[field])
+                else:
+                    fields.pop(field, None)
 
-            await mail_settings.save()
+            await update_fields(mail_settings, fields, incoming_data.revision)
 
             return BaseResponse(
                 isOk=True,
@@ -380,6 +388,7 @@ async def post_mail(
     if incoming_type == 'smtp':
         password = encrypt_password(incoming_data.password)
         del incoming_data.password
+        del incoming_data.revision
 
         new_configuration = SMTPServer(
             uid=str(uuid6.uuid7()),
@@ -390,6 +399,7 @@ async def post_mail(
     elif incoming_type == 'microsoft365':
         secret_key = encrypt_password(incoming_data.secretKey)
         del incoming_data.secretKey
+        del incoming_data.revision
 
         new_configuration = Microsoft365(
             uid=str(uuid6.uuid7()),
@@ -632,6 +642,10 @@ async def get_analytics(
             "description": "Ungültige Konfigurationsdaten – Validierung fehlgeschlagen",
             "model": GeneralExceptionSchema
         },
+        409: {
+            "description": "Konfiguration wurde zwischenzeitlich geändert",
+            "model": GeneralExceptionSchema
+        },
         401: {
             "description": "Nicht autorisiert – Token fehlt oder ist ungültig",
             "model": GeneralExceptionSchema
@@ -657,12 +671,13 @@ async def post_analytics(
 
     analytics = await MatomoConfig.find_one()
     if analytics:
-        for field, value in data.model_dump(exclude_unset=True).items():
-            if field == "matomoApiKey":
-                value = encrypt_password(value)
-            setattr(analytics, field, value)
+        fields = data.model_dump(exclude_unset=True)
+        if fields.get("matomoApiKey") and fields["matomoApiKey"] != decrypt_password(analytics.matomoApiKey):
+            fields["matomoApiKey"] = encrypt_password(fields["matomoApiKey"])
+        else:
+            fields.pop("matomoApiKey", None)
 
-        await analytics.save()
+        await update_fields(analytics, fields, data.revision)
         return BaseResponse(
             isOk=True,
             status="OK",
@@ -670,6 +685,7 @@ async def post_analytics(
         )
     api_key = encrypt_password(data.matomoApiKey)
     del data.matomoApiKey
+    del data.revision
 
     new_configuration = MatomoConfig(
         uid=str(uuid6.uuid7()),
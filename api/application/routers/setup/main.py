@@ -3,7 +3,8 @@ import secrets
 import uuid6
 from fastapi import APIRouter
 from application import init_db
-from application.modules.auth.security import hash_password
+from application.modules.auth.hashing import hash_password_async
+from application.modules.database.runtime_settings import load_runtime_settings, set_runtime_settings
 from application.modules.database.database_models import Microsoft365, SMTPServer, User, MatomoConfig, WhiteLabelConfig, \
     EmailVerification
 from application.modules.mail.mailer import send_html_email, prepare_base64_image, get_base64_image
@@ -11,6 +12,8 @@ from application.modules.schemas.request_schemas import SetupData
 from application.modules.schemas.response_schemas import SetupResponse, GeneralExceptionSchema, BaseResponse, \
     ValidationError, GeneralException
 from application.modules.setup.setup_env import setup_env
+from application.modules.users.search import user_search_keys
+from application.modules.utils.lifespan import start_background_services
 from application.modules.utils.crypto import encrypt_password
 from application.modules.utils.logger import get_logger
 from application.modules.utils.settings import get_settings
@@ -113,7 +116,7 @@ async def complete_setup(data: SetupData):
             external_url=data.branding.externalUrl
         )
 
-        await init_db(logger=logger, settings=settings)
+        await init_db(logger=logger, settings=get_settings())
 
         existing_admin = await User.find_one(User.role == "admin")
 
@@ -128,17 +131,19 @@ async def complete_setup(data: SetupData):
         admin_user = User(
             uid=user_uid,
             email=data.adminUser.email,
-            password=hash_password(data.adminUser.password),
+            password=await hash_password_async(data.adminUser.password),
             firstName=data.adminUser.firstName,
             lastName=data.adminUser.lastName,
             isActive=False if data.adminUser.emailVerification else True,
             role='admin',
-            lastSeen=datetime.datetime.now()
+            lastSeen=datetime.datetime.now(),
+            searchKeys=user_search_keys(data.adminUser.email, data.adminUser.firstName, data.adminUser.lastName)
         )
 
         await admin_user.create()
 
         await WhiteLabelConfig.find_all().delete()
+        del data.branding.revision
 
         new_white_label_config = WhiteLabelConfig(
             uid=str(uuid6.uuid7()),
@@ -152,6 +157,7 @@ async def complete_setup(data: SetupData):
 
             encrypted_password = encrypt_password(data.mailServer.microsoft365.secretKey)
             del data.mailServer.microsoft365.secretKey
+            del data.mailServer.microsoft365.revision
 
             new_configuration = Microsoft365(
                 uid=str(uuid6.uuid7()),
@@ -166,6 +172,7 @@ async def complete_setup(data: SetupData):
 
             encrypted_password = encrypt_password(data.mailServer.smtp.password)
             del data.mailServer.smtp.password
+            del data.mailServer.smtp.revision
 
             new_configuration = SMTPServer(
                 uid=str(uuid6.uuid7()),
@@ -208,6 +215,7 @@ async def complete_setup(data: SetupData):
 
             encrypted_password = encrypt_password(data.analytics.matomoApiKey)
             del data.analytics.matomoApiKey
+            del data.analytics.revision
 
             new_configuration = MatomoConfig(
                 uid=str(uuid6.uuid7()),
@@ -219,10 +227,15 @@ async def complete_setup(data: SetupData):
 
         logger.info(f"✅ Setup abgeschlossen von {data.adminUser.email} @ {datetime.datetime.now()}")
 
+        await load_runtime_settings()
+        await set_runtime_settings(
+            SELF_SIGNUP=str(data.selfSignup.enabled).lower()
+        )
+
         setup_env(
-            self_signup=str(data.selfSignup.enabled).lower(),
             setup_completed="true"
         )
+        await start_background_services()
 
         return BaseResponse(
             isOk=True,
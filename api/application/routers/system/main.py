@@ -1,24 +1,38 @@
+import asyncio
 import datetime
 import secrets
 from pathlib import Path as FilePath
 import uuid6
-from fastapi import APIRouter, Depends
-from motor.motor_asyncio import AsyncIOMotorClient
+from fastapi import APIRouter, Depends, Query
 from time import perf_counter
 from fastapi import Path
 from starlette import status
 from starlette.responses import FileResponse, Response
+from application.modules.auth.cache import get_auth_cache_stats
 from application.modules.auth.dependencies import require_role
+from application.modules.auth.hashing import get_hashing_stats
+from application.modules.auth.ip_allowlist import validate_allowlist
+from application.modules.auth.login_logger import get_login_log_stats
+from application.modules.auth.presence import get_presence_stats
+from application.modules.auth.rate_limit import get_rate_limit_stats
+from application.modules.auth.public_keys import get_public_key_cache_stats, invalidate_public_keys, \
+    hash_public_key, mask_public_key
 from application.modules.backup.scheduler import start_backup_scheduler, run_mongo_backup, is_scheduler_running, \
     stop_backup_scheduler
 from application.modules.schemas.request_schemas import BackupSettingsRequest
 from application.modules.schemas.response_schemas import (ValidationError, GeneralException, DbHealthResponse,
                                                           BaseResponse, GeneralExceptionSchema, PingResponse,
                                                           StatusResponse, PublicKeysResponse, CreatePublicKeyResponse,
-                                                          BackupStatusResponse, BackupListResponse)
+                                                          BackupStatusResponse, BackupListResponse, MetricsResponse,
+                                                          ReadinessResponse)
 from application.modules.database.database_models import UserRole, SMTPServer, Microsoft365, MatomoConfig, PublicKeys
 from application.modules.schemas.schemas import ServerStatusSchema, DatabaseHealthSchema, PublicKeySchema, BackupFile
-from application.modules.setup.setup_env import setup_env, BackupFrequency
+from application.modules.database.connection import get_mongo_client
+from application.modules.database.health import get_health_snapshot, get_health_prober_stats
+from application.modules.database.runtime_settings import set_runtime_settings
+from application.modules.setup.setup_env import BackupFrequency
+from application.modules.utils.readiness import check_readiness
+from application.modules.utils.export import ExportFormat, PUBLIC_KEY_EXPORT_FIELDS, select_fields, export_response
 from application.modules.utils.settings import get_settings
 
 router = APIRouter()
@@ -60,29 +74,101 @@ router = APIRouter()
 async def get_status():
     settings = get_settings()
 
-    database_online = False
-    uri = settings.MONGODB_URI
-    if uri:
-        client = AsyncIOMotorClient(uri)
-        result = await client.admin.command("ping")
+    async def database_online() -> bool:
+        if not settings.MONGODB_URI:
+            return False
+        snapshot, _age = await get_health_snapshot()
+        return snapshot["online"]
 
-        if result.get("ok") == 1:
-            database_online = True
+    online, smtp, m365, matomo = await asyncio.gather(
+        database_online(), SMTPServer.find_one(), Microsoft365.find_one(), MatomoConfig.find_one()
+    )
 
     return StatusResponse(
         isOk=True,
         status="OK",
         message=f"Status überprüft",
         data=ServerStatusSchema(
-            databaseOnline=database_online,
+            databaseOnline=online,
             selfSignupEnabled=settings.SELF_SIGNUP,
-            smtpServerConfigured=True if await SMTPServer.find_one() else False,
-            m365Configured=True if await Microsoft365.find_one() else False,
-            matomoConfigured=True if await MatomoConfig.find_one() else False,
+            smtpServerConfigured=smtp is not None,
+            m365Configured=m365 is not None,
+            matomoConfigured=matomo is not None,
         )
     )
 
 
+@router.get("/live",
+            status_code=200,
+            tags=["🔍 System"],
+            name="Liveness-Probe",
+            description="""
+                Meldet, dass der API-Prozess läuft und Anfragen beantwortet. Es werden keine Abhängigkeiten geprüft
+                und keine I/O ausgeführt – geeignet als Liveness-Probe für Orchestrierung und Load Balancer.
+
+                🛡️ Kein Auth-Token erforderlich, auch vor Abschluss des Setups erreichbar.
+            """,
+            response_description="Prozess läuft",
+            responses={
+                200: {
+                    'description': 'Prozess läuft',
+                    'model': BaseResponse
+                }
+            })
+async def get_live():
+    return BaseResponse(
+        isOk=True,
+        status="ALIVE",
+        message="API läuft"
+    )
+
+
+@router.get("/ready",
+            status_code=200,
+            tags=["🔍 System"],
+            name="Readiness-Probe",
+            description="""
+                Prüft parallel, ob die Abhängigkeiten der API erreichbar sind, jeweils mit eigenem Timeout
+                (`READINESS_PROBE_TIMEOUT_SECONDS`).
+
+                ✅ Enthält:
+                - MongoDB: ping (kritisch)
+                - SMTP: TCP-Verbindung zum konfigurierten Mailserver
+                - Microsoft 365: Gültigkeit des gespeicherten Graph-Tokens
+                - Matomo: Erreichbarkeit der konfigurierten Instanz
+
+                💡 Hinweise:
+                - Ergebnisse werden zwischengespeichert und nach `READINESS_CACHE_SECONDS` im Hintergrund erneuert;
+                  `ageSeconds` gibt das Alter an
+                - Nur kritische Probes entscheiden über 200 bzw. 503, die übrigen werden nur gemeldet
+                - Nicht konfigurierte Dienste werden als `skipped` gemeldet
+
+                🛡️ Kein Auth-Token erforderlich, auch vor Abschluss des Setups erreichbar.
+            """,
+            response_description="Ergebnis je Abhängigkeit",
+            responses={
+                200: {
+                    'description': 'Bereit – alle kritischen Abhängigkeiten erreichbar',
+                    'model': ReadinessResponse
+                },
+                503: {
+                    'description': 'Nicht bereit – mindestens eine kritische Abhängigkeit ist nicht erreichbar',
+                    'model': ReadinessResponse
+                }
+            })
+async def get_ready(response: Response):
+    ready, results = await check_readiness()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(
+        isOk=ready,
+        status="READY" if ready else "NOT_READY",
+        message="Bereit" if ready else "Mindestens eine kritische Abhängigkeit ist nicht erreichbar",
+        data=results
+    )
+
+
 
 @router.get('/ping',
             name="MongoDB Verbindung prüfen (ohne Authentifizierung)",
@@ -118,7 +204,7 @@ async def ping():
             is_ok=False
         )
 
-    client = AsyncIOMotorClient(uri)
+    client = get_mongo_client()
 
     try:
         start = perf_counter()
@@ -147,13 +233,18 @@ async def ping():
             name="MongoDB Verbindung prüfen",
             summary="MongoDB Health Check",
             description="""
-                Führt einen schnellen Health-Check gegen die MongoDB-Datenbank aus und prüft, ob eine Verbindung erfolgreich aufgebaut werden kann.
+                Liefert den Health-Snapshot der MongoDB-Datenbank (ping, serverStatus, dbstats).
 
                 ✅ Nützlich für:
                 - System-Monitoring und Statusanzeigen
                 - Fehlerbehandlung im Frontend (z.B. Wartungsseiten)
                 - DevOps & Deployment-Prozesse
 
+                💡 Hinweise:
+                - Der Snapshot wird im Hintergrund alle `HEALTH_PROBE_INTERVAL_SECONDS` erneuert, `ageSeconds` gibt sein Alter an
+                - `refresh=true` erzwingt eine neue Messung, höchstens alle `HEALTH_FORCE_REFRESH_MIN_SECONDS` –
+                  sonst wird der vorhandene Snapshot geliefert
+
                 🔐 **Erfordert gültigen Login-Token**
             """,
             response_description="Verbindungsstatus zur MongoDB",
@@ -174,6 +265,7 @@ async def ping():
                 }
             })
 async def mongodb_health(
+        refresh: bool = Query(False, description="Snapshot neu messen statt den zwischengespeicherten zu liefern"),
         _user=Depends(require_role(UserRole.admin))
 ):
     settings = get_settings()
@@ -187,41 +279,73 @@ async def mongodb_health(
             is_ok=False
         )
 
-    client = AsyncIOMotorClient(uri)
-
-    try:
-        start = perf_counter()
-        result = await client.admin.command("ping")
-        duration = (perf_counter() - start) * 1000
-
-        if result.get("ok") == 1:
-            server_status = await client.admin.command("serverStatus")
-            db_stats = await client.get_database(settings.MONGODB_DB_NAME).command("dbstats")
-
-            return DbHealthResponse(
-                isOk=True,
-                status="DB_HEALTH_OK",
-                message="Verbindungsstatus zur MongoDB OK",
-                data=DatabaseHealthSchema(
-                    dbName=settings.MONGODB_DB_NAME,
-                    serverVersion=server_status["version"],
-                    uptimeSeconds=server_status["uptime"],
-                    connectionCount=server_status["connections"]["current"],
-                    latencyMs=round(duration, 2),
-                    indexes=db_stats["indexes"],
-                    storageSizeMB=round(db_stats["storageSize"] / 1024 / 1024, 2)
-                )
-            )
-        raise Exception("Ping fehlgeschlagen")
-
-    except Exception as e:
+    snapshot, age = await get_health_snapshot(force_refresh=refresh)
+    if not snapshot["online"]:
         raise GeneralException(
-            exception=f"Fehler beim Verbindungsaufbau zur MongoDB. {str(e)}",
+            exception=f"Fehler beim Verbindungsaufbau zur MongoDB. {snapshot['error']}",
             status_code=500,
             status="DB_HEALTH_ERROR",
             is_ok=False
         )
 
+    return DbHealthResponse(
+        isOk=True,
+        status="DB_HEALTH_OK",
+        message="Verbindungsstatus zur MongoDB OK",
+        data=DatabaseHealthSchema(**snapshot["data"]),
+        checkedAt=snapshot["checkedAt"],
+        ageSeconds=age
+    )
+
+
+@router.get("/metrics",
+            name="Interne Laufzeit-Metriken",
+            summary="Cache- und Laufzeitmetriken",
+            description="""
+                Gibt prozessinterne Laufzeitmetriken des aktuellen Workers zurück.
+
+                ✅ Enthält:
+                - Auth-Cache: Größe, Hits, Misses und Trefferquote für Token- und Benutzer-Cache
+                - Passwort-Hashing: Auslastung, abgelehnte Anfragen und Latenzen (p50/p95/p99)
+                - Public-Key-Cache: Trefferquote und noch nicht geschriebene Nutzungszeitpunkte
+                - Login-Protokoll: gepufferte, geschriebene und verworfene Login-Einträge
+                - Rate-Limits: erlaubte/abgelehnte Anfragen je Bereich und die aktivsten Schlüssel
+
+                ℹ️ Die Werte gelten pro Worker-Prozess und werden beim Neustart zurückgesetzt.
+
+                🔐 **Erfordert gültigen Login-Token**
+            """,
+            response_description="Metriken des aktuellen Worker-Prozesses",
+            tags=["🔍 System"],
+            status_code=200,
+            responses={
+                200: {
+                    'model': MetricsResponse,
+                    'description': 'Metriken erfolgreich abgefragt'
+                },
+                500: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Interner Serverfehler'
+                }
+            })
+async def get_metrics(
+        _user=Depends(require_role(UserRole.admin))
+):
+    return MetricsResponse(
+        isOk=True,
+        status="OK",
+        message="Metriken abgefragt",
+        data={
+            "authCache": get_auth_cache_stats(),
+            "passwordHashing": get_hashing_stats(),
+            "publicKeyCache": get_public_key_cache_stats(),
+            "rateLimits": get_rate_limit_stats(),
+            "loginLog": get_login_log_stats(),
+            "presence": get_presence_stats(),
+            "healthProber": get_health_prober_stats(),
+        }
+    )
+
 
 # endregion
 
@@ -425,9 +549,9 @@ async def put_backup_frequency(
         data: BackupSettingsRequest,
         _=Depends(require_role("admin"))
 ):
-    setup_env(
-        backup_frequency=data.frequency,
-        backup_cleanup=str(data.cleanUpDays) if data.cleanUpDays else "30"
+    await set_runtime_settings(
+        BACKUP_FREQUENCY=data.frequency.name,
+        BACKUP_CLEANUP=str(data.cleanUpDays) if data.cleanUpDays else "30"
     )
     return BaseResponse(
         isOk=True,
@@ -501,8 +625,8 @@ async def post_backup_manually():
 async def post_start_backup(
         _user=Depends(require_role("admin"))
 ):
-    setup_env(
-        backup_started="true"
+    await set_runtime_settings(
+        BACKUP_STARTED="true"
     )
     start_backup_scheduler()
 
@@ -543,8 +667,8 @@ async def post_start_backup(
 async def get_stop_backup(
         _=Depends(require_role("admin"))
 ):
-    setup_env(
-        backup_started="false"
+    await set_runtime_settings(
+        BACKUP_STARTED="false"
     )
     stop_backup_scheduler()
 
@@ -662,6 +786,50 @@ async def get_public_keys(
     )
 
 
+@router.get("/public-keys/export",
+            name="Public API Keys exportieren",
+            summary="Public API Keys als NDJSON/CSV exportieren",
+            description="""
+                Exportiert die Public API Keys als NDJSON oder CSV, gestreamt direkt vom Datenbank-Cursor.
+
+                💡 Hinweise:
+                - Feldauswahl über `fields` (kommagetrennt), z.B. `uid,name,lastUsedAt`
+                - Filter nach `isActive`
+                - Schlüssel werden nur maskiert exportiert, der SHA-256-Digest nie
+
+                🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Public API Keys als NDJSON- bzw. CSV-Datei",
+            tags=["🔐 Public API Keys"],
+            status_code=200,
+            responses={
+                200: {
+                    'content': {'application/x-ndjson': {}, 'text/csv': {}},
+                    'description': 'Export wird gestreamt'
+                },
+                400: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Unbekannte Felder in `fields`'
+                },
+                401: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Nicht autorisiert'
+                }
+            })
+async def get_public_keys_export(
+        export_format: ExportFormat = Query("ndjson", alias="format", description="Ausgabeformat"),
+        fields: str | None = Query(None, description="Kommagetrennte Feldauswahl"),
+        is_active: bool | None = Query(None, alias="isActive", description="Nur aktive bzw. inaktive Keys"),
+        _=Depends(require_role("admin"))
+):
+    query = {} if is_active is None else {"isActive": is_active}
+
+    return export_response(
+        PublicKeys.get_motor_collection(), query, select_fields(fields, PUBLIC_KEY_EXPORT_FIELDS), [("createdAt", 1)],
+        export_format, "public-keys"
+    )
+
+
 @router.post("/public-keys",
              name="Neuen Public API Key erstellen",
              summary="API Key erzeugen",
@@ -700,23 +868,36 @@ async def post_public_keys(
         data: PublicKeySchema,
         current_user=Depends(require_role("admin"))
 ):
+    try:
+        allowed_ips = validate_allowlist(data.allowedIps) if data.allowedIps else None
+    except ValueError as e:
+        raise GeneralException(
+            is_ok=False,
+            status="INVALID_ALLOWED_IPS",
+            exception=f"Ungültige IP-Adresse oder ungültiges CIDR-Netz: {e}",
+            status_code=400
+        )
+
     key = f"cortex-{secrets.token_urlsafe(24)}"
     new_public_key = PublicKeys(
         uid=str(uuid6.uuid7()),
-        key=key,
+        key=mask_public_key(key),
+        keyHash=hash_public_key(key),
         createdBy=current_user.uid,
         name=data.name,
         description=data.description,
-        allowedIps=data.allowedIps,
+        allowedIps=allowed_ips,
         isActive=data.isActive,
     )
     await new_public_key.create()
+    invalidate_public_keys()
     return CreatePublicKeyResponse(
         isOk=True,
         status="OK",
         message="Public Key erfolgreich erstellt",
         publicKey=PublicKeySchema(
-            **new_public_key.__dict__
+            **new_public_key.model_dump(exclude={"key", "keyHash"}),
+            key=key
         )
     )
 
@@ -771,6 +952,7 @@ async def put_public_keys(
 
     public_key.isActive = data.isActive
     await public_key.save()
+    invalidate_public_keys()
 
     return BaseResponse(
         isOk=True,
@@ -832,6 +1014,7 @@ async def delete_public_keys(
             status_code=400
         )
     await public_key.delete()
+    invalidate_public_keys()
 
     return Response(
         status_code=status.HTTP_204_NO_CONTENT
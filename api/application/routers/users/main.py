@@ -1,18 +1,38 @@
+import asyncio
 import datetime
-from fastapi import APIRouter, Depends, Path
+import math
+import re
+from typing import Literal
+from fastapi import APIRouter, Depends, Path, Query
 from starlette import status
+from starlette.requests import Request
 from starlette.responses import Response
 from uuid6 import uuid7
 
+from application.modules.auth.cache import invalidate_user
 from application.modules.auth.dependencies import require_role
-from application.modules.auth.security import hash_password
-from application.modules.database.database_models import User, UserRole, Logins
+from application.modules.auth.revocation import revoke_user_tokens
+from application.modules.auth.hashing import hash_password_async
+from application.modules.auth.login_stats import get_day_stats
+from application.modules.auth.presence import get_online_count
+from application.modules.database.database_models import User, UserRole
+from application.modules.database.partial_update import update_fields
 from application.modules.schemas.response_schemas import ValidationError, UsersResponse, BaseResponse, GeneralException, \
-    GeneralExceptionSchema
+    GeneralExceptionSchema, UserImportResponse, UserSearchResponse
 from application.modules.schemas.schemas import UpdateUser, GetUser, CreateUserAdmin
+from application.modules.users.bulk_import import import_users
+from application.modules.users.search import search_users, user_search_keys
+from application.modules.utils.export import ExportFormat, USER_EXPORT_FIELDS, select_fields, export_response
+from application.modules.utils.settings import get_settings
+from application.modules.utils.pagination import encode_cursor, decode_cursor, keyset_filter
 
 router = APIRouter()
 
+# Sortierung der Benutzerliste, abgedeckt durch die Indizes (isActive, uid) und (role, isActive, uid)
+USERS_SORT = [("isActive", -1), ("uid", 1)]
+# Deckt role und isActive ab und damit alle ungefilterten Kopfzahlen
+USERS_COUNT_INDEX = [("role", 1), ("isActive", -1), ("uid", 1)]
+
 
 @router.get("/users",
             status_code=status.HTTP_200_OK,
@@ -29,6 +49,11 @@ router = APIRouter()
             - Aktivitätsstatus (optional)
             - Letzte Anmeldung (optional)
 
+            💡 Hinweise:
+            - Aktive Benutzer zuerst, seitenweise (`limit`); `nextCursor` als `cursor` übergeben für die nächste Seite
+            - Filter nach `role`, `isActive` und E-Mail-Präfix (`emailPrefix`)
+            - `onlineUsers`: Benutzer mit Aktivität in den letzten `PRESENCE_ONLINE_SECONDS` Sekunden
+
             🔐 Hinweis:
             Diese Route ist geschützt und nur mit gültigem Admin-Token erreichbar.
             """,
@@ -49,28 +74,174 @@ router = APIRouter()
                 }
             })
 async def get_users(
+        limit: int = Query(50, ge=1, le=500, description="Anzahl der Benutzer pro Seite"),
+        cursor: str | None = Query(None, description="Cursor der nächsten Seite"),
+        page: int = Query(1, ge=1, description="Nummer der angeforderten Seite (nur für die Seitenangaben)"),
+        role: Literal["viewer", "writer", "editor", "admin"] | None = Query(None, description="Nur Benutzer dieser Rolle"),
+        is_active: bool | None = Query(None, alias="isActive", description="Nur aktive bzw. inaktive Benutzer"),
+        email_prefix: str | None = Query(None, alias="emailPrefix", description="E-Mail beginnt mit"),
         _user=Depends(require_role(UserRole.admin))
 ):
-    users = await User.find_all().sort("-is_active").to_list()
+    filters: dict = {}
+    if role:
+        filters["role"] = role
+    if is_active is not None:
+        filters["isActive"] = is_active
+    if email_prefix:
+        filters["email"] = {"$regex": f"^{re.escape(email_prefix)}"}
+
+    query = dict(filters)
+    if cursor:
+        query.update(keyset_filter(USERS_SORT, decode_cursor(cursor, len(USERS_SORT))))
 
-    now = datetime.datetime.now()
-    from_today = datetime.datetime(now.year, now.month, now.day)
+    # Alle Kopfzahlen in einem $facet. Das vorgeschaltete $match beschränkt die Eingabe auf die Vereinigung der
+    # drei Zählmengen (je Zweig indexgestützt); ohne Filter zählt total alle Benutzer und der Hinweis auf den
+    # (role, isActive, uid)-Index macht daraus einen reinen Index-Scan ohne Dokumentzugriffe.
+    if filters:
+        counter_stages = [{"$match": {"$or": [filters, {"role": "admin"}, {"isActive": True}]}}]
+        counter_options = {}
+    else:
+        counter_stages = [{"$project": {"_id": 0, "role": 1, "isActive": 1}}]
+        counter_options = {"hint": USERS_COUNT_INDEX}
+    counter_stages.append({"$facet": {
+        "total": [{"$match": filters}, {"$count": "count"}],
+        "administrators": [{"$match": {"role": "admin"}}, {"$count": "count"}],
+        "activeUsers": [{"$match": {"isActive": True}}, {"$count": "count"}]
+    }})
 
-    todays_logins = await Logins.find(Logins.timestamp >= from_today).count()
-    admin_count = await User.find(User.role == "admin").count()
-    active_users = await User.find(User.isActive == True).count()
+    # Seite, Kopfzahlen und Tagesstatistik laufen parallel
+    users, counters, todays_stats = await asyncio.gather(
+        User.find(query).sort(USERS_SORT).limit(limit + 1).project(GetUser).to_list(),
+        User.get_motor_collection().aggregate(counter_stages, **counter_options).to_list(1),
+        get_day_stats(datetime.date.today())
+    )
+    counts = {name: result[0]["count"] if result else 0 for name, result in counters[0].items()}
+    total = counts["total"]
+
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor(users[-1].isActive, users[-1].uid)
 
     return UsersResponse(
         isOk=True,
         status="OK",
         message="Benutzer gefunden",
-        data=[GetUser(
-            accessToken=None,
-            **user.model_dump(exclude={"password"})
-        ) for user in users],
-        todaysLogins=todays_logins,
-        administrators=admin_count,
-        activeUsers=active_users
+        data=users,
+        page=page,
+        pagesTotal=math.ceil(total / limit),
+        pagesLeft=max(math.ceil(total / limit) - page, 0),
+        nextCursor=next_cursor,
+        todaysLogins=todays_stats.success + todays_stats.failed if todays_stats else 0,
+        todaysFailedLogins=todays_stats.failed if todays_stats else 0,
+        administrators=counts["administrators"],
+        activeUsers=counts["activeUsers"],
+        onlineUsers=get_online_count()
+    )
+
+
+@router.get("/users/search",
+            status_code=status.HTTP_200_OK,
+            summary="Benutzer suchen (Typeahead)",
+            description="""
+            Sucht Benutzer, deren E-Mail-Adresse, Vor-, Nach- oder vollständiger Name mit dem Suchbegriff beginnt.
+
+            💡 Hinweise:
+            - Groß-/Kleinschreibung und Akzente werden ignoriert (`jür` findet „Jürgen“ und „Juri“)
+            - Liefert höchstens `limit` Treffer, ohne Gesamtzahl
+            - Mit `fuzzy=true` wird der Volltextindex abgefragt (ganze Wörter, nach Relevanz sortiert);
+              erfordert `USER_TEXT_SEARCH=true`
+
+            🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Gefundene Benutzer",
+            tags=["👥 Benutzerverwaltung"],
+            responses={
+                200: {
+                    'model': UserSearchResponse,
+                    'description': 'Suche ausgeführt'
+                },
+                400: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Volltextsuche ist nicht aktiviert'
+                },
+                422: {
+                    'model': ValidationError,
+                    'description': 'Validierungsfehler in der Anfrage'
+                },
+                500: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Interner Serverfehler'
+                }
+            })
+async def get_users_search(
+        q: str = Query(..., min_length=1, max_length=100, description="Suchbegriff"),
+        limit: int = Query(10, ge=1, le=50, description="Maximale Anzahl der Treffer"),
+        fuzzy: bool = Query(False, description="Volltextsuche statt Präfixsuche"),
+        _user=Depends(require_role(UserRole.admin))
+):
+    if fuzzy and not get_settings().USER_TEXT_SEARCH:
+        raise GeneralException(
+            is_ok=False,
+            status="BAD_REQUEST",
+            exception="Die Volltextsuche ist nicht aktiviert (USER_TEXT_SEARCH)",
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
+    return UserSearchResponse(
+        isOk=True,
+        status="OK",
+        message="Suche ausgeführt",
+        data=await search_users(q, limit, fuzzy)
+    )
+
+
+@router.get("/users/export",
+            status_code=status.HTTP_200_OK,
+            summary="Benutzer exportieren (NDJSON/CSV)",
+            description="""
+            Exportiert Benutzer als NDJSON oder CSV. Die Antwort wird direkt vom Datenbank-Cursor gestreamt,
+            der Speicherbedarf bleibt unabhängig von der Anzahl der Benutzer konstant.
+
+            💡 Hinweise:
+            - Feldauswahl über `fields` (kommagetrennt), z.B. `uid,email,role`; Passwörter werden nie exportiert
+            - Filter nach `role` und `isActive`
+            - Sortiert nach `uid`
+
+            🔐 **Nur mit gültigem Admin-Token zugänglich**
+            """,
+            response_description="Benutzer als NDJSON- bzw. CSV-Datei",
+            tags=["👥 Benutzerverwaltung"],
+            responses={
+                200: {
+                    'content': {'application/x-ndjson': {}, 'text/csv': {}},
+                    'description': 'Export wird gestreamt'
+                },
+                400: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Unbekannte Felder in `fields`'
+                },
+                422: {
+                    'model': ValidationError,
+                    'description': 'Validierungsfehler in der Anfrage'
+                }
+            })
+async def get_users_export(
+        export_format: ExportFormat = Query("ndjson", alias="format", description="Ausgabeformat"),
+        fields: str | None = Query(None, description="Kommagetrennte Feldauswahl"),
+        role: Literal["viewer", "writer", "editor", "admin"] | None = Query(None, description="Nur Benutzer dieser Rolle"),
+        is_active: bool | None = Query(None, alias="isActive", description="Nur aktive bzw. inaktive Benutzer"),
+        _user=Depends(require_role(UserRole.admin))
+):
+    query: dict = {}
+    if role:
+        query["role"] = role
+    if is_active is not None:
+        query["isActive"] = is_active
+
+    return export_response(
+        User.get_motor_collection(), query, select_fields(fields, USER_EXPORT_FIELDS), [("uid", 1)],
+        export_format, "users"
     )
 
 
@@ -125,12 +296,13 @@ async def post_users(
         new_user = User(
             uid=uid,
             email=data.email,
-            password=hash_password(data.password),
+            password=await hash_password_async(data.password),
             firstName=data.firstName,
             lastName=data.lastName,
             isActive=data.isActive,
             role=data.role,
-            lastSeen=None
+            lastSeen=None,
+            searchKeys=user_search_keys(data.email, data.firstName, data.lastName)
         )
         await new_user.create()
 
@@ -149,6 +321,69 @@ async def post_users(
         )
 
 
+@router.post("/users/import",
+             name="Benutzer importieren",
+             summary="Benutzer per NDJSON oder CSV anlegen bzw. aktualisieren (Admin-only)",
+             description="""
+                Legt Benutzer aus einem gestreamten NDJSON- oder CSV-Body (eine Zeile pro Benutzer) an
+                und aktualisiert optional bestehende Benutzer mit gleicher E-Mail-Adresse.
+
+                📥 Erwartet pro Zeile:
+                - `email` (str)
+                - `password` (str, für neue Benutzer erforderlich)
+                - `firstName`, `lastName`, `role`, `isActive` (optional)
+
+                💡 Hinweise:
+                - Format über `format` oder den `Content-Type` (`application/x-ndjson` bzw. `text/csv`)
+                - CSV benötigt eine Kopfzeile mit den Spaltennamen
+                - Passwörter werden parallel gehasht, geschrieben wird blockweise per `bulk_write`
+                - Die Antwort enthält ein Ergebnis pro Zeile; fehlerhafte Zeilen brechen den Import nicht ab
+
+                🔐 **Nur mit gültigem Admin-Token zugänglich**
+             """,
+             status_code=status.HTTP_200_OK,
+             response_description="Ergebnis pro importierter Zeile",
+             tags=["👥 Benutzerverwaltung"],
+             responses={
+                 200: {
+                     'model': UserImportResponse,
+                     'description': 'Import abgeschlossen'
+                 },
+                 401: {
+                     'model': GeneralExceptionSchema,
+                     'description': 'Nicht autorisiert'
+                 },
+                 422: {
+                     'model': ValidationError,
+                     'description': 'Validierungsfehler in der Anfrage'
+                 },
+                 500: {
+                     'model': GeneralExceptionSchema,
+                     'description': 'Interner Serverfehler'
+                 }
+             })
+async def post_users_import(
+        request: Request,
+        import_format: Literal["ndjson", "csv"] | None = Query(None, alias="format", description="Format des Bodys"),
+        update_existing: bool = Query(False, alias="updateExisting", description="Bestehende Benutzer aktualisieren"),
+        _user=Depends(require_role("admin"))
+):
+    if import_format is None:
+        import_format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+    results = await import_users(request.stream(), import_format, update_existing)
+
+    return UserImportResponse(
+        isOk=True,
+        status="OK",
+        message="Import abgeschlossen",
+        created=sum(1 for result in results if result.status == "created"),
+        updated=sum(1 for result in results if result.status == "updated"),
+        failed=sum(1 for result in results if result.status == "failed"),
+        data=results
+    )
+
+
 @router.put("/users/{uid}",
             name="Benutzer aktualisieren",
             summary="Bestehenden Benutzer ändern",
@@ -162,6 +397,10 @@ async def post_users(
                 - Rolle
                 - Passwort (optional)
 
+                💡 Hinweise:
+                - Es werden nur geänderte Felder geschrieben.
+                - Mit `revision` aus GET /users wird geprüft, ob der Benutzer zwischenzeitlich geändert wurde (409).
+
                 🔐 **Nur mit gültigem Admin-Token zugänglich**
             """,
             status_code=status.HTTP_200_OK,
@@ -184,6 +423,10 @@ async def post_users(
                     'model': GeneralExceptionSchema,
                     'description': 'Benutzer nicht gefunden'
                 },
+                409: {
+                    'model': GeneralExceptionSchema,
+                    'description': 'Benutzer wurde zwischenzeitlich geändert'
+                },
                 422: {
                     'model': ValidationError,
                     'description': 'Validierungsfehler in der Anfrage'
@@ -207,18 +450,26 @@ async def update_user(
             status_code=status.HTTP_404_NOT_FOUND
         )
 
+    fields = {}
     if data.firstName:
-        user.firstName = data.firstName
+        fields["firstName"] = data.firstName
     if data.lastName:
-        user.lastName = data.lastName
+        fields["lastName"] = data.lastName
     if data.role:
-        user.role = data.role
+        fields["role"] = data.role
     if data.isActive is not None:
-        user.isActive = data.isActive
+        fields["isActive"] = data.isActive
     if data.password:
-        user.password = hash_password(data.password)
+        fields["password"] = await hash_password_async(data.password)
+    if data.firstName or data.lastName:
+        fields["searchKeys"] = user_search_keys(
+            user.email, data.firstName or user.firstName, data.lastName or user.lastName
+        )
 
-    await user.create()
+    changes = await update_fields(user, fields, data.revision)
+    invalidate_user(uid)
+    if "role" in changes or "password" in changes or changes.get("isActive") is False:
+        await revoke_user_tokens(uid)
 
     return BaseResponse(
         isOk=True,
@@ -277,7 +528,9 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND
         )
 
+    await revoke_user_tokens(uid)
     await user.delete()
+    invalidate_user(uid)
 
     return Response(
         status_code=status.HTTP_204_NO_CONTENT
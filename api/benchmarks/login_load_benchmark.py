@@ -0,0 +1,64 @@
+"""
+Last-Benchmark: Latenz von /system/ping, während /auth/login parallel unter Last steht.
+
+Erwartet eine laufende API-Instanz und einen existierenden Benutzer:
+
+    python -m benchmarks.login_load_benchmark --url http://localhost:8000/api/v1 \\
+        --email admin@cortex.ui --password geheim --concurrency 32 --duration 15
+"""
+import argparse
+import asyncio
+from time import perf_counter
+import httpx
+
+
+def percentile(samples: list[float], value: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(value / 100 * (len(ordered) - 1))))]
+
+
+async def hammer_login(client: httpx.AsyncClient, url: str, email: str, password: str, stop_at: float,
+                       results: dict):
+    while perf_counter() < stop_at:
+        response = await client.post(f"{url}/auth/login", data={"username": email, "password": password})
+        results[response.status_code] = results.get(response.status_code, 0) + 1
+
+
+async def probe_ping(client: httpx.AsyncClient, url: str, stop_at: float, latencies: list[float]):
+    while perf_counter() < stop_at:
+        start = perf_counter()
+        await client.get(f"{url}/system/ping")
+        latencies.append((perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    latencies: list[float] = []
+    login_results: dict[int, int] = {}
+    stop_at = perf_counter() + args.duration
+
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        await asyncio.gather(
+            probe_ping(client, args.url, stop_at, latencies),
+            *[hammer_login(client, args.url, args.email, args.password, stop_at, login_results)
+              for _ in range(args.concurrency)]
+        )
+
+    print(f"Login-Antworten:   {dict(sorted(login_results.items()))}")
+    print(f"Ping-Anfragen:     {len(latencies)}")
+    print(f"Ping p50 / p99:    {percentile(latencies, 50):.2f} ms / {percentile(latencies, 99):.2f} ms")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
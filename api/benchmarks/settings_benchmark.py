@@ -0,0 +1,31 @@
+"""
+Micro-Benchmark für get_settings().
+
+Vergleicht das bisherige Verhalten (dotenv_values + Validierung bei jedem Aufruf)
+mit dem gecachten Settings-Snapshot. Ausführen aus dem api-Verzeichnis:
+
+    python -m benchmarks.settings_benchmark
+"""
+import timeit
+
+from dotenv import dotenv_values
+from application.modules.utils.settings import Settings, get_settings, ENV_FILE
+
+ITERATIONS = 10_000
+
+
+def legacy_get_settings():
+    return Settings(**dotenv_values(ENV_FILE))
+
+
+def main():
+    get_settings()
+
+    for label, func in (("vorher (dotenv + Validierung)", legacy_get_settings),
+                        ("nachher (gecachter Snapshot)", get_settings)):
+        total = timeit.timeit(func, number=ITERATIONS)
+        print(f"{label:<32} {total / ITERATIONS * 1_000_000:>10.2f} µs/Aufruf")
+
+
+if __name__ == '__main__':
+    main()
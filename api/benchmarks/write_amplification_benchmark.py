@@ -0,0 +1,86 @@
+"""
+Micro-Benchmark für die Schreiblast bei Teil-Updates.
+
+Vergleicht die Größe des update-Befehls (BSON) beim Ersetzen des kompletten Dokuments (save)
+mit einem $set nur der geänderten Felder inkl. Revisionsprüfung. Ausführen aus dem api-Verzeichnis:
+
+    python -m benchmarks.write_amplification_benchmark
+"""
+import base64
+import datetime
+import os
+import timeit
+
+import bson
+
+ITERATIONS = 10_000
+LOGO_BYTES = 256 * 1024
+
+
+def _user() -> dict:
+    return {
+        "_id": bson.ObjectId(),
+        "uid": "01981d65-0881-786d-8e00-b7b25f19c88f",
+        "email": "john.doe@cortex.ui",
+        "password": "$2b$12$" + "x" * 53,
+        "firstName": "John",
+        "lastName": "Doe",
+        "role": "editor",
+        "isActive": True,
+        "lastSeen": datetime.datetime.now(),
+        "tokenVersion": 0,
+        "revision": 3
+    }
+
+
+def _white_label() -> dict:
+    return {
+        "_id": bson.ObjectId(),
+        "uid": "01981d65-0881-786d-8e00-b7b25f19c88f",
+        "logo": {
+            "contentType": "image/png",
+            "name": "CortexLogo.png",
+            "data": base64.b64encode(os.urandom(LOGO_BYTES)).decode(),
+            "lastModified": datetime.datetime.now()
+        },
+        "title": "Cortex UI",
+        "showTitle": True,
+        "subtitle": "Admin Dashboard",
+        "description": None,
+        "contactMail": "info@cortex.ui",
+        "contactPhone": None,
+        "contactFax": None,
+        "revision": 7
+    }
+
+
+def replace_command(document: dict, changes: dict) -> bytes:
+    return bson.encode({"q": {"_id": document["_id"]}, "u": {**document, **changes}})
+
+
+def set_command(document: dict, changes: dict) -> bytes:
+    return bson.encode({
+        "q": {"_id": document["_id"], "revision": document["revision"]},
+        "u": {"$set": changes, "$inc": {"revision": 1}}
+    })
+
+
+def main():
+    cases = (
+        ("Benutzer: Rolle ändern", _user(), {"role": "admin"}),
+        ("Benutzer: Name ändern", _user(), {"firstName": "Jane", "lastName": "Roe"}),
+        ("WhiteLabel: Titel ändern (Logo)", _white_label(), {"title": "Cortex"}),
+    )
+
+    print(f"{'Fall':<34} {'save':>12} {'$set':>10} {'Faktor':>8} {'save µs':>10} {'$set µs':>9}")
+    for label, document, changes in cases:
+        replace_size = len(replace_command(document, changes))
+        set_size = len(set_command(document, changes))
+        replace_time = timeit.timeit(lambda: replace_command(document, changes), number=ITERATIONS)
+        set_time = timeit.timeit(lambda: set_command(document, changes), number=ITERATIONS)
+        print(f"{label:<34} {replace_size:>10} B {set_size:>8} B {replace_size / set_size:>7.1f}x "
+              f"{replace_time / ITERATIONS * 1_000_000:>10.2f} {set_time / ITERATIONS * 1_000_000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+
+# Die Settings legen beim Import eine .env im Arbeitsverzeichnis an – die Tests laufen daher in einem
+# temporären Verzeichnis, bevor irgendein Modul der Anwendung importiert wird
+_work_dir = tempfile.mkdtemp(prefix="cortex-tests-")
+atexit.register(shutil.rmtree, _work_dir, ignore_errors=True)
+os.chdir(_work_dir)
+
+import mongomock_motor  # noqa: E402
+import pytest  # noqa: E402
+from beanie import Document, init_beanie  # noqa: E402
+import application.modules.database.database_models as database_models  # noqa: E402
+
+
+async def _init_db():
+    # mongomock kennt keine Time-Series-Collections
+    database_models.Logins.Settings.timeseries = None
+    models = [
+        model for model in vars(database_models).values()
+        if isinstance(model, type) and issubclass(model, Document) and model is not Document
+    ]
+    database = mongomock_motor.AsyncMongoMockClient().get_database("cortex-test")
+    await init_beanie(database=database, document_models=models)
+    return database
+
+
+@pytest.fixture
+def database():
+    """
+    Frische Mock-Datenbank mit allen Beanie-Models je Test.
+    """
+    return asyncio.run(_init_db())
@@ -0,0 +1,38 @@
+import asyncio
+from application.modules.database.database_models import User
+from application.routers.auth.main import _store_rehash
+
+
+async def _create_user(password: str) -> User:
+    user = User(uid="user-1", email="user1@example.com", password=password, firstName="", lastName="",
+                role="viewer", isActive=True, tokenVersion=0)
+    await user.create()
+    return user
+
+
+def test_rehash_replaces_outdated_hash(database):
+    async def run():
+        user = await _create_user("old-hash")
+        await _store_rehash(user, "new-hash")
+        return await User.find_one(User.uid == "user-1")
+
+    stored = asyncio.run(run())
+
+    assert stored.password == "new-hash"
+    assert stored.revision == 1
+
+
+def test_rehash_does_not_overwrite_concurrent_password_change(database):
+    async def run():
+        user = await _create_user("old-hash")
+        # Ein Admin ändert das Passwort, während der Login noch den alten Hash prüft
+        await User.get_motor_collection().update_one(
+            {"uid": "user-1"}, {"$set": {"password": "admin-hash"}, "$inc": {"revision": 1}}
+        )
+        await _store_rehash(user, "rehash-of-old-password")
+        return await User.find_one(User.uid == "user-1")
+
+    stored = asyncio.run(run())
+
+    assert stored.password == "admin-hash"
+    assert stored.revision == 1
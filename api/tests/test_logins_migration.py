@@ -0,0 +1,80 @@
+import asyncio
+import datetime
+import logging
+import mongomock_motor
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from application.modules.database import logins_timeseries
+from application.modules.database.database_models import Logins
+from application.modules.database.logins_timeseries import migrate_legacy_logins, LEGACY_LOGINS_COLLECTION, \
+    LOGINS_MIGRATION_COLLECTION
+
+logger = logging.getLogger("test")
+
+
+@pytest.fixture(autouse=True)
+def collection_options(monkeypatch):
+    # mongomock kennt list_collections nicht, für die Migration genügt die Existenz der Collection
+    async def options(db, name):
+        return {} if name in await db.list_collection_names() else None
+
+    monkeypatch.setattr(logins_timeseries, "_collection_options", options)
+
+
+def _legacy_logins(count: int) -> list[dict]:
+    return [
+        {"_id": ObjectId(), "userUid": "user-1", "timestamp": datetime.datetime(2026, 1, 1, minute=i),
+         "ipAddress": "127.0.0.1", "userAgent": "pytest", "status": "success"}
+        for i in range(count)
+    ]
+
+
+async def _collection_names(database) -> set[str]:
+    return set(await database.list_collection_names())
+
+
+def test_migrates_all_batches(database):
+    async def run():
+        await database[LEGACY_LOGINS_COLLECTION].insert_many(_legacy_logins(5))
+        await migrate_legacy_logins(database, logger, batch_size=2)
+        return await Logins.get_motor_collection().count_documents({}), await _collection_names(database)
+
+    count, names = asyncio.run(run())
+
+    assert count == 5
+    assert LEGACY_LOGINS_COLLECTION not in names
+    assert LOGINS_MIGRATION_COLLECTION not in names
+
+
+def test_resume_after_crash_does_not_duplicate(database):
+    legacy = _legacy_logins(5)
+
+    async def run():
+        # Abbruch nach insert_many des ersten Batches, aber vor dem Löschen aus der alten Collection
+        await database[LEGACY_LOGINS_COLLECTION].insert_many(legacy)
+        await Logins.get_motor_collection().insert_many(legacy[:2])
+        await database[LOGINS_MIGRATION_COLLECTION].insert_one(
+            {"_id": Logins.Settings.name, "pendingUpTo": legacy[1]["_id"]}
+        )
+
+        await migrate_legacy_logins(database, logger, batch_size=2)
+        return [document["_id"] async for document in Logins.get_motor_collection().find({}, {"_id": 1})]
+
+    ids = asyncio.run(run())
+
+    assert sorted(ids) == sorted(document["_id"] for document in legacy)
+
+
+def test_bulk_write_error_keeps_legacy_data(database, monkeypatch):
+    async def failing_insert_many(*_args, **_kwargs):
+        raise BulkWriteError({"writeErrors": [{"index": 0, "errmsg": "failed"}], "nInserted": 0})
+
+    async def run():
+        await database[LEGACY_LOGINS_COLLECTION].insert_many(_legacy_logins(3))
+        monkeypatch.setattr(mongomock_motor.AsyncMongoMockCollection, "insert_many", failing_insert_many)
+        await migrate_legacy_logins(database, logger, batch_size=2)
+        return await database[LEGACY_LOGINS_COLLECTION].count_documents({})
+
+    # Der Start wird nicht abgebrochen, die Einträge bleiben für den nächsten Versuch erhalten
+    assert asyncio.run(run()) == 3
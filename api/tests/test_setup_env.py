@@ -0,0 +1,40 @@
+import pytest
+from dotenv import dotenv_values
+from application.modules.setup.setup_env import write_env_atomic
+
+VALUES = {
+    "PLAIN": "cortex",
+    "QUOTE": "it's",
+    "QUOTE_END": "quote'",
+    "BACKSLASH": "C:\\backup\\cortex",
+    "BACKSLASH_QUOTE": "a\\'b",
+    "BACKSLASH_END": "mongodb://user:pa\\",
+    "HASH": "a #b",
+    "EMPTY": "",
+}
+
+
+def test_write_env_round_trip(tmp_path):
+    env_file = tmp_path / ".env"
+    write_env_atomic(env_file, VALUES)
+
+    assert dotenv_values(env_file) == VALUES
+
+
+@pytest.mark.parametrize("value", [" leading\\", "'quoted\\", "a #b\\"])
+def test_unrepresentable_value_keeps_env(tmp_path, value):
+    env_file = tmp_path / ".env"
+    write_env_atomic(env_file, {"KEY": "old"})
+
+    with pytest.raises(ValueError):
+        write_env_atomic(env_file, {"KEY": value})
+    assert dotenv_values(env_file) == {"KEY": "old"}
+    assert list(tmp_path.iterdir()) == [env_file]
+
+
+def test_none_values_are_skipped(tmp_path):
+    env_file = tmp_path / ".env"
+    write_env_atomic(env_file, {"UNSET": None, "KEY": "value"})
+
+    assert "None" not in env_file.read_text()
+    assert dotenv_values(env_file) == {"KEY": "value"}
@@ -0,0 +1,33 @@
+import asyncio
+import datetime
+import time
+import pytest
+from jose import jwt
+from application.modules.auth.revocation import revoke_user_tokens
+from application.modules.auth.security import create_access_token
+from application.modules.database.database_models import TokenRevocation
+
+
+@pytest.fixture
+def berlin_time(monkeypatch):
+    """
+    Lokale Zeitzone östlich von UTC, in der naive Zeitstempel von UTC abweichen.
+    """
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_revocation_outlives_access_token(database, berlin_time):
+    token = create_access_token({"uid": "user-1"})
+    token_expires_at = jwt.get_unverified_claims(token)["exp"]
+
+    asyncio.run(revoke_user_tokens("user-1"))
+    revocation = asyncio.run(TokenRevocation.get_motor_collection().find_one({"userUid": "user-1"}))
+    # MongoDB (und damit der TTL-Monitor) liest naive Zeitstempel als UTC
+    revocation_expires_at = revocation["expiresAt"].replace(tzinfo=datetime.timezone.utc).timestamp()
+
+    assert time.localtime().tm_gmtoff != 0
+    assert abs(revocation_expires_at - token_expires_at) < 5
@@ -0,0 +1,40 @@
+import asyncio
+import datetime
+from application.modules.auth import revocation
+from application.modules.auth.cache import user_cache
+from application.modules.database.database_models import TokenRevocation
+from application.modules.utils.cache import TTLCache
+
+
+def test_revocation_from_other_worker_invalidates_cached_user(database, monkeypatch):
+    monkeypatch.setattr(revocation, "_revoked", {})
+    user_cache.set("user-1", object())
+    user_cache.set("user-2", object())
+
+    async def run():
+        # Sperre, wie sie ein anderer Worker über revoke_user_tokens schreibt
+        await TokenRevocation(
+            userUid="user-1",
+            minTokenVersion=1,
+            expiresAt=datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        ).create()
+        await revocation.load_revocations()
+
+    asyncio.run(run())
+
+    assert user_cache.get("user-1") is None
+    assert user_cache.get("user-2") is not None
+    assert revocation.is_token_revoked("user-1", 0)
+
+
+def test_ttl_cache_follows_changed_limits():
+    limits = {"size": 2}
+    cache = TTLCache(lambda: limits["size"], 60)
+    for key in range(3):
+        cache.set(key, key)
+    assert cache.stats()["size"] == 2
+
+    limits["size"] = 1
+    cache.set(3, 3)
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["maxSize"] == 1
@@ -0,0 +1,92 @@
+import asyncio
+import datetime
+import mongomock_motor
+import pytest
+from application.modules.database.database_models import User
+from application.routers.users.main import get_users, USERS_COUNT_INDEX
+
+# Collection-Methoden, die jeweils genau ein Datenbank-Kommando auslösen
+DB_COMMANDS = ("find", "find_one", "aggregate", "count_documents", "estimated_document_count")
+
+
+@pytest.fixture
+def commands(monkeypatch) -> list[str]:
+    """
+    Zeichnet jedes Datenbank-Kommando (Collection und Methode) der Mock-Datenbank auf.
+    """
+    recorded = []
+    collection_class = mongomock_motor.AsyncMongoMockCollection
+
+    def counting(method_name, method):
+        def wrapper(self, *args, **kwargs):
+            recorded.append(f"{self.name}.{method_name}")
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    for name in DB_COMMANDS:
+        monkeypatch.setattr(collection_class, name, counting(name, getattr(collection_class, name)))
+    return recorded
+
+
+async def _insert_users():
+    await User.get_motor_collection().insert_many([
+        {"uid": f"user-{i}", "email": f"user{i}@example.com", "password": "-", "firstName": "", "lastName": "",
+         "role": "admin" if i < 2 else "viewer", "isActive": i % 3 != 0,
+         "lastSeen": None if i == 1 else datetime.datetime(2026, 1, 1), "tokenVersion": 0, "revision": 0}
+        for i in range(12)
+    ])
+
+
+async def _get_users(**filters):
+    params = {"limit": 5, "cursor": None, "page": 1, "role": None, "is_active": None, "email_prefix": None}
+    return await get_users(**{**params, **filters}, _user=None)
+
+
+@pytest.fixture
+def pipelines(monkeypatch) -> list[tuple[list, dict]]:
+    """
+    Zeichnet die Pipelines (und Optionen) aller Aggregationen auf.
+    """
+    recorded = []
+    aggregate = mongomock_motor.AsyncMongoMockCollection.aggregate
+
+    def wrapper(self, pipeline, **kwargs):
+        recorded.append((pipeline, kwargs))
+        return aggregate(self, pipeline, **kwargs)
+
+    monkeypatch.setattr(mongomock_motor.AsyncMongoMockCollection, "aggregate", wrapper)
+    return recorded
+
+
+@pytest.mark.parametrize("filters, total", [({}, 12), ({"role": "viewer", "is_active": True}, 7)])
+def test_get_users_round_trips(database, pipelines, commands, filters, total):
+    async def run():
+        await _insert_users()
+        commands.clear()
+        return await _get_users(**filters)
+
+    response = asyncio.run(run())
+
+    # Seite, Kopfzahlen ($facet) und Tagesstatistik – je ein Kommando, parallel
+    assert sorted(commands) == ["LoginStats.find_one", "Users.aggregate", "Users.find"], commands
+    assert response.administrators == 2
+    assert response.activeUsers == 8
+    assert response.pagesTotal == -(-total // 5)
+    assert len(response.data) == 5
+
+
+def test_counter_pipeline_starts_index_backed(database, pipelines):
+    async def run():
+        await _insert_users()
+        await _get_users()
+        await _get_users(role="viewer")
+
+    asyncio.run(run())
+
+    (unfiltered, unfiltered_options), (filtered, _options) = pipelines
+    # Ohne Filter: reiner Index-Scan über (role, isActive, uid)
+    assert unfiltered_options["hint"] == USERS_COUNT_INDEX
+    assert set(unfiltered[0]["$project"]) <= {"_id", *(field for field, _direction in USERS_COUNT_INDEX)}
+    # Mit Filter: $match auf die Vereinigung der Zählmengen vor dem $facet
+    assert filtered[0] == {"$match": {"$or": [{"role": "viewer"}, {"role": "admin"}, {"isActive": True}]}}
+    assert set(filtered[-1]["$facet"]) == {"total", "administrators", "activeUsers"}
@@ -9,6 +9,7 @@ import {
     User,
     ShieldAlert,
     KeyRound,
+    Activity,
     X,
     Save
 } from 'lucide-react';
@@ -49,28 +50,37 @@ const AdminUsers = () => {
     const [searchTerm, setSearchTerm] = useState('')
     const [todaysLogins, setTodaysLogins] = useState<number>(0)
     const [activeUsers, setActiveUsers] = useState<number>(0)
+    const [onlineUsers, setOnlineUsers] = useState<number>(0)
     const [administrators, setAdministrators] = useState<number>(0)
     const [users, setUsers] = useState<UserPublic[]>([])
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
     const [editingUser, setEditingUser] = useState<EditUser | null>(null);
     const [showForm, setShowForm] = useState<boolean>(false);
     const [reload, setReload] = useState<boolean>(true)
     const [newUser, setNewUser] = useState(emptyUser);
 
+    function loadUsers(cursor: string | null = null) {
+        const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''
+        fetchWithAuth(`${process.env.NEXT_PUBLIC_API_URI}/api/v1/users${query}`, {
+            method: 'GET',
+        })
+            .then(res => res.json())
+            .then(json => {
+                if (json.isOk) {
+                    setUsers(current => cursor ? [...current, ...json.data] : json.data)
+                    setNextCursor(json.nextCursor)
+                    setTodaysLogins(json.todaysLogins)
+                    setActiveUsers(json.activeUsers)
+                    setOnlineUsers(json.onlineUsers)
+                    setAdministrators(json.administrators)
+                }
+            })
+    }
+
     useEffect(() => {
         if (reload) {
             setReload(false)
-            fetchWithAuth(`${process.env.NEXT_PUBLIC_API_URI}/api/v1/users`, {
-                method: 'GET',
-            })
-                .then(res => res.json())
-                .then(json => {
-                    if (json.isOk) {
-                        setUsers(json.data)
-                        setTodaysLogins(json.todaysLogins)
-                        setActiveUsers(json.activeUsers)
-                        setAdministrators(json.administrators)
-                    }
-                })
+            loadUsers()
         }
     }, [reload]);
 
@@ -249,10 +259,17 @@ const AdminUsers = () => {
                         ))}
                         </tbody>
                     </table>
+                    {nextCursor && (
+                        <div className={"flex justify-center pt-4"}>
+                            <Button variant={"outline"} onClick={() => loadUsers(nextCursor)}>
+                                Weitere Benutzer laden
+                            </Button>
+                        </div>
+                    )}
                 </div>
             </div>
 
-            <div className={"grid grid-cols-1 md:grid-cols-3 gap-6"}>
+            <div className={"grid grid-cols-1 md:grid-cols-4 gap-6"}>
                 <div className={"bg-slate-100 border border-slate-200  rounded-lg p-6"}>
                     <div className={"flex items-center gap-3"}>
                         <div className={"bg-green-500/40 p-3 rounded-lg"}>
@@ -300,6 +317,22 @@ const AdminUsers = () => {
                         </div>
                     </div>
                 </div>
+
+                <div className={"bg-slate-100 border border-slate-200  rounded-lg p-6"}>
+                    <div className={"flex items-center gap-3"}>
+                        <div className={"bg-purple-500/40 p-3 rounded-lg"}>
+                            <Activity className={"h-6 w-6 text-purple-600"} />
+                        </div>
+                        <div>
+                            <p className={"text-gray-500 text-sm"}>
+                                Jetzt online
+                            </p>
+                            <p className={"text-2xl font-bold text-slate-900"}>
+                                {onlineUsers}
+                            </p>
+                        </div>
+                    </div>
+                </div>
             </div>
             {showForm && (
                 <div className={"fixed inset-0 bg-black/50 flex items-center justify-center z-50"}>
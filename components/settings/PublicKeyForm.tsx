@@ -68,8 +68,9 @@ export default function PublicKeyForm({
             .then(res => res.json())
             .then(json => {
                 if (json.isOk) {
-                    setPublicKeys([...publicKeys, json.publicKey]);
-                    setNewlyCreatedKey(json.publicKey.key);
+                    const key: string = json.publicKey.key;
+                    setPublicKeys([...publicKeys, {...json.publicKey, key: `${key.substring(0, 10)}…${key.substring(key.length - 4)}`}]);
+                    setNewlyCreatedKey(key);
                     setFormData({
                         name: "",
                         description: "",
@@ -3,7 +3,6 @@ import { format } from "date-fns";
 import { de } from "date-fns/locale";
 import {
     Search,
-    Copy,
     Trash2,
     Clock,
     CheckCircle,
@@ -40,10 +39,6 @@ export function PublicKeySettings() {
         key.name.toLowerCase().includes(searchQuery.toLowerCase())
     );
 
-    const truncateKey = (key: string) => {
-        return `${key.substring(0, 8)}...${key.substring(key.length - 4)}`;
-    };
-
     const copyToClipboard = async (text: string) => {
         try {
             await navigator.clipboard.writeText(text);
@@ -179,7 +174,7 @@ export function PublicKeySettings() {
                                 </TableCell>
                                 <TableCell>
                                     <code className={"font-mono text-sm bg-slate-100 border border-slate-200 px-2 py-1 rounded"}>
-                                        {truncateKey(apiKey.key ?? '')}
+                                        {apiKey.key}
                                     </code>
                                 </TableCell>
                                 <TableCell>
@@ -242,15 +237,6 @@ export function PublicKeySettings() {
                                                 </Button>
                                             </DropdownMenuTrigger>
                                             <DropdownMenuContent align={"end"}>
-                                                <DropdownMenuItem onClick={(e: React.MouseEvent) => {
-                                                    e.preventDefault()
-                                                    copyToClipboard(apiKey.key ?? '').then(() => console.log('copied'))
-                                                }}>
-                                                    <Copy className={"mr-2 h-4 w-4"} />
-                                                    <span>
-                                                        Kopieren
-                                                    </span>
-                                                </DropdownMenuItem>
                                                 <DropdownMenuItem onClick={(e: React.MouseEvent) => {
                                                     e.preventDefault()
                                                     toggleActivation(apiKey.uid ?? '')
@@ -6,6 +6,7 @@ import {AuthContextType} from "@/types/Context";
 import {UserPublic} from "@/types/User";
 import {WhiteLabelConfig} from "@/types/WhiteLabel";
 import {ServerStatus} from "@/types/System";
+import {refreshAccessToken} from "@/lib/fetchWithAuth";
 
 const AuthContext = createContext<AuthContextType | null>(null);
 
@@ -104,6 +105,7 @@ export const AuthProvider = ({children}: { children: React.ReactNode }) => {
             }
 
             localStorage.setItem('access_token', json.data.accessToken);
+            localStorage.setItem('refresh_token', json.data.refreshToken);
 
             const userRes = await fetch(`${process.env.NEXT_PUBLIC_API_URI}/api/v1/auth/me`, {
                 headers: {
@@ -128,6 +130,7 @@ export const AuthProvider = ({children}: { children: React.ReactNode }) => {
 
     const logout = () => {
         localStorage.removeItem('access_token');
+        localStorage.removeItem('refresh_token');
         setUser(null);
     };
 
@@ -142,15 +145,19 @@ export const AuthProvider = ({children}: { children: React.ReactNode }) => {
                 await refreshWhiteLabelConfig();
                 await refreshSystemStatus();
 
-                const token = localStorage.getItem('access_token');
-                if (!token) return;
+                if (!localStorage.getItem('access_token')) return;
 
-                const res = await fetch(`${process.env.NEXT_PUBLIC_API_URI}/api/v1/auth/me`, {
+                const fetchMe = () => fetch(`${process.env.NEXT_PUBLIC_API_URI}/api/v1/auth/me`, {
                     headers: {
-                        Authorization: `Bearer ${token}`,
+                        Authorization: `Bearer ${localStorage.getItem('access_token')}`,
                     },
                 });
 
+                let res = await fetchMe();
+                if (res.status === 401 && await refreshAccessToken()) {
+                    res = await fetchMe();
+                }
+
                 if (res.status === 200) {
                     const json = await res.json();
                     setUser(json.data);
@@ -1,26 +1,63 @@
 'use client'
 
+let refreshPromise: Promise<boolean> | null = null;
+
+export async function refreshAccessToken(): Promise<boolean> {
+    // Parallele 401-Antworten teilen sich einen Refresh, da jedes Refresh-Token nur einmal gültig ist
+    if (!refreshPromise) {
+        refreshPromise = (async () => {
+            const refreshToken = localStorage.getItem("refresh_token");
+            if (!refreshToken) return false;
+
+            try {
+                const res = await fetch(`${process.env.NEXT_PUBLIC_API_URI}/api/v1/auth/refresh`, {
+                    method: "POST",
+                    headers: {"Content-Type": "application/json"},
+                    body: JSON.stringify({refreshToken}),
+                });
+                if (res.status !== 200) {
+                    localStorage.removeItem("refresh_token");
+                    return false;
+                }
+
+                const json = await res.json();
+                localStorage.setItem("access_token", json.data.accessToken);
+                localStorage.setItem("refresh_token", json.data.refreshToken);
+                return true;
+            } catch {
+                return false;
+            }
+        })().finally(() => {
+            refreshPromise = null;
+        });
+    }
+    return refreshPromise;
+}
+
 export async function fetchWithAuth(
     input: RequestInfo,
     init: RequestInit = {}
 ): Promise<Response> {
-    const token = localStorage.getItem("access_token");
-
-    const headers: HeadersInit = {
-        ...(init.headers || {}),
-        Authorization: `Bearer ${token}`,
-        "Content-Type": "application/json",
-    };
-
-    const res = await fetch(input, {
+    const send = () => fetch(input, {
         ...init,
-        headers,
+        headers: {
+            ...(init.headers || {}),
+            Authorization: `Bearer ${localStorage.getItem("access_token")}`,
+            "Content-Type": "application/json",
+        },
     });
 
+    let res = await send();
+
+    if (res.status === 401 && await refreshAccessToken()) {
+        res = await send();
+    }
+
     if (res.status === 401) {
         localStorage.removeItem("access_token")
+        localStorage.removeItem("refresh_token")
         window.location.href = "/login?session_expired"
     }
 
     return res;
-}
\ No newline at end of file
+}
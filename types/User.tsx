@@ -5,5 +5,5 @@ export type UserPublic = {
     lastName: string;
     role: string;
     isActive: boolean;
-    lastSeen: Date | string;
+    lastSeen: Date | string | null;
 };